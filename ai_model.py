@@ -1,20 +1,60 @@
-import tensorflow as tf
+import os
+import joblib
 import networkx as nx
 import numpy as np
 import yaml
 from sklearn.preprocessing import StandardScaler
+from src.deadlock import iter_cycles
+from src.recovery import plan_recovery, apply_recovery
+
+# Cycle enumeration for the cycle-count feature stops here
+CYCLE_FEATURE_CAP = 50
+
+class SequenceBuffer:
+    """Fixed-size ring buffer of the last N feature vectors of one system"""
+    def __init__(self, length, num_features):
+        self.length = length
+        # Every row is written twice (at i and i + length), so the latest
+        # window is always the contiguous slice data[head:head + length].
+        self.data = np.zeros((2 * length, num_features), dtype=np.float32)
+        self.head = 0
+        self.count = 0
+        
+    def push(self, features):
+        """Append one feature vector in O(1), evicting the oldest"""
+        self.data[self.head] = features
+        self.data[self.head + self.length] = features
+        self.head = (self.head + 1) % self.length
+        self.count = min(self.count + 1, self.length)
+        
+    def window(self):
+        """Oldest-to-newest view of the last N vectors (zero padded until full, no copy)"""
+        return self.data[self.head:self.head + self.length]
+        
+    def __len__(self):
+        return self.count
 
 class DeadlockPredictor:
     def __init__(self):
         with open("config.yaml") as f:
             self.config = yaml.safe_load(f).get('ai', {})
             
-        self.model = self.build_model()
-        self.scaler = StandardScaler()
+        self._model = None  # Built on first use, TensorFlow import is slow
+        self._infer = None
+        self.scaler_path = self.config.get('scaler_path', 'lstm_scaler.pkl')
+        self.scaler = self.load_scaler()
         self.risk_history = []
+        self.buffers = {}  # system id -> SequenceBuffer
+        
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = self.build_model()
+        return self._model
         
     def build_model(self):
         """Build and compile the neural network model"""
+        import tensorflow as tf
         model = tf.keras.Sequential([
             tf.keras.layers.LSTM(128, 
                                input_shape=(self.config.get('sequence_length', 20), 
@@ -27,25 +67,95 @@ class DeadlockPredictor:
                      metrics=['accuracy'])
         return model
     
-    def calculate_risk(self, edges, model_type="LSTM Predictor"):
+    @property
+    def infer(self):
+        """Compiled forward pass; the fixed input signature avoids retracing per batch size"""
+        if self._infer is None:
+            import tensorflow as tf
+            model = self.model
+            spec = tf.TensorSpec((None,
+                                  self.config.get('sequence_length', 20),
+                                  self.config.get('num_features', 5)), tf.float32)
+            self._infer = tf.function(lambda x: model(x, training=False), input_signature=[spec])
+        return self._infer
+    
+    def load_scaler(self):
+        """Load the persisted feature scaler, or None if it has not been fitted yet"""
+        if os.path.exists(self.scaler_path):
+            return joblib.load(self.scaler_path)
+        return None
+    
+    def fit_scaler(self, graphs):
+        """Fit the feature scaler once on a corpus of edge lists and persist it"""
+        raw = np.array([self.raw_lstm_features(nx.DiGraph(edges)) for edges in graphs])
+        self.scaler = StandardScaler().fit(raw)
+        joblib.dump(self.scaler, self.scaler_path)
+        return self.scaler
+    
+    def calculate_risk_batch(self, graphs, batch_size=1024):
+        """LSTM risk for many edge lists, one compiled model call per batch"""
+        if not graphs:
+            return np.zeros(0)
+        sequences = np.concatenate([self.create_sequence_input(nx.DiGraph(edges))
+                                    for edges in graphs])
+        risks = self.lstm_risks(sequences, batch_size)
+        self.risk_history.extend(risks.tolist())
+        return risks
+    
+    def lstm_risks(self, sequences, batch_size=1024):
+        """Run stacked (n, sequence_length, num_features) inputs through the compiled model"""
+        sequences = np.asarray(sequences, dtype=np.float32)
+        return np.concatenate([self.infer(sequences[i:i + batch_size]).numpy()[:, 0]
+                               for i in range(0, len(sequences), batch_size)])
+    
+    def calculate_risk(self, edges, model_type="LSTM Predictor", system_id=None):
         """Calculate deadlock risk probability with proper input shaping"""
         G = nx.DiGraph(edges)
         
         if model_type == "LSTM Predictor":
             # Create sequence data with padding
-            features = self.create_sequence_input(G)
-            risk = self.model.predict(features)[0][0]
+            features = self.create_sequence_input(G, system_id)
+            risk = float(self.lstm_risks(features)[0])
         else:
             risk = self.graph_based_risk(G)
             
         self.risk_history.append(risk)
         return risk
     
-    def create_sequence_input(self, G):
+    def observe(self, edges, system_id="default"):
+        """Record one snapshot of a system in its sequence buffer"""
+        buffer = self.buffers.get(system_id)
+        if buffer is None:
+            buffer = self.buffers[system_id] = SequenceBuffer(
+                self.config.get('sequence_length', 20),
+                self.config.get('num_features', 5))
+        buffer.push(self.extract_lstm_features(nx.DiGraph(edges)))
+        
+    def track(self, monitor, system_id="default"):
+        """Feed every version of a RealTimeMonitor into the system's sequence buffer"""
+        # Kept up to date from the monitor's deltas instead of copying its edge set per batch
+        graph = nx.DiGraph(list(monitor.snapshot().edges))
+        
+        def on_change(version, events):
+            for op, (u, v) in events:
+                if op == "add":
+                    graph.add_edge(u, v)
+                elif graph.has_edge(u, v):
+                    graph.remove_edge(u, v)
+            self.observe(graph.edges(), system_id)
+        
+        monitor.subscribe(on_change)
+        
+    def create_sequence_input(self, G, system_id=None):
         """Create sequence input for LSTM with padding"""
         seq_length = self.config.get('sequence_length', 20)
         num_features = self.config.get('num_features', 5)
         
+        # Use the real history of a tracked system when there is one
+        buffer = self.buffers.get(system_id)
+        if buffer is not None and len(buffer):
+            return buffer.window()[np.newaxis]
+        
         # Get current features
         current_features = self.extract_lstm_features(G)
         
@@ -57,13 +167,20 @@ class DeadlockPredictor:
     
     def extract_lstm_features(self, G):
         """Feature extraction for LSTM model"""
+        features = self.raw_lstm_features(G)
+        if self.scaler is None:
+            return features
+        return self.scaler.transform([features])[0]
+    
+    def raw_lstm_features(self, G):
+        """Unscaled LSTM feature vector"""
         features = np.zeros(5)
         features[0] = len(G.edges()) / 10  # Normalized edge count
         features[1] = nx.density(G)        # Graph density
         features[2] = len(G.nodes()) / 10  # Normalized node count
         features[3] = nx.number_strongly_connected_components(G) / 5
-        features[4] = len(list(nx.simple_cycles(G))) / 5
-        return self.scaler.fit_transform([features])[0]
+        features[4] = sum(1 for _ in iter_cycles(G, max_cycles=CYCLE_FEATURE_CAP)) / 5
+        return features
     
     def graph_based_risk(self, G):
         """Alternative risk calculation for graph-based models"""
@@ -75,15 +192,18 @@ class DeadlockPredictor:
     
     def auto_correct(self, edges):
         """Automatically correct deadlock by breaking cycle"""
-        G = nx.DiGraph(edges)
-        try:
-            cycle = list(nx.find_cycle(G))
-            st.success("✅ System State Normal")
-            # Remove the last edge in the cycle
-            return [edge for edge in edges if edge != cycle[-1]]
-        except nx.NetworkXNoCycle:
-            return edges
+        plan = plan_recovery(edges, mode="edge")
+        # Remove the cheapest set of edges that breaks every cycle
+        return apply_recovery(edges, plan["victims"], mode="edge")
     
     def get_risk_history(self):
         """Return risk history for visualization"""
-        return self.risk_history[-20:]
\ No newline at end of file
+        return self.risk_history[-20:]
+
+if __name__ == "__main__":
+    # Fit and persist the LSTM feature scaler on the training dataset
+    from dataset_loader import load_edge_table
+    table = load_edge_table("deadlock_dataset.csv")
+    predictor = DeadlockPredictor()
+    predictor.fit_scaler(table.edge_lists())
+    print(f"💾 Scaler saved as '{predictor.scaler_path}'")
@@ -0,0 +1,157 @@
+"""
+Headless batch analyzer for recorded resource allocation graph snapshots.
+
+Usage:
+    python analyze_snapshots.py snapshots/ -o results.jsonl --workers 8
+
+Accepted inputs (a single file or a directory of them):
+    .csv    dataset files with a 'Graph' column (like deadlock_dataset.csv)
+    .jsonl  one snapshot per line, either [[src, dst], ...] or {"id": ..., "edges": [...]}
+    .txt    one snapshot per file in the "P1->R1" export format of main.py
+    a binary corpus directory written by rag_corpus.py
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from src.deadlock import detect_deadlock
+from dataset_loader import parse_edge_list
+from prediction_engine import DeadlockPredictor
+from rag_corpus import RAGCorpus
+
+SNAPSHOT_EXTENSIONS = (".csv", ".jsonl", ".txt")
+
+
+def iter_snapshots(path):
+    """Yield (snapshot_id, edges) for every snapshot in a file or directory."""
+    if os.path.isfile(os.path.join(path, "meta.json")):
+        corpus = RAGCorpus(path)
+        for i in range(len(corpus)):
+            yield f"{path}:{i}", corpus.graph_edges(i)
+        return
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(SNAPSHOT_EXTENSIONS):
+                yield from iter_snapshots(os.path.join(path, name))
+        return
+
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for row_id, row in enumerate(csv.DictReader(f)):
+                yield f"{path}:{row_id}", parse_edge_list(row["Graph"])
+    elif path.endswith(".jsonl"):
+        with open(path) as f:
+            for line_no, line in enumerate(f):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    yield record.get("id", f"{path}:{line_no}"), [tuple(e) for e in record["edges"]]
+                else:
+                    yield f"{path}:{line_no}", [tuple(e) for e in record]
+    else:
+        with open(path) as f:
+            text = f.read().replace("\n", ",")
+        yield path, [(edge.split("->")[0].strip(), edge.split("->")[1].strip())
+                     for edge in text.split(",") if "->" in edge]
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_chunk(chunk, model_type, max_cycles):
+    """Worker entry point: cycle detection plus batched risk scoring for one chunk."""
+    ids = [snapshot_id for snapshot_id, _ in chunk]
+    graphs = [edges for _, edges in chunk]
+    scores = DeadlockPredictor().predict_batch(graphs, model_type)
+
+    results = []
+    for snapshot_id, edges, row in zip(ids, graphs, scores.itertuples(index=False)):
+        deadlock, cycles = detect_deadlock(edges, max_cycles=max_cycles, witness_only=max_cycles is None)
+        results.append({
+            "id": snapshot_id,
+            "deadlock": deadlock,
+            "cycles": cycles,
+            "risk": round(float(row.risk), 4),
+            "node_count": int(row.node_count),
+            "edge_count": int(row.edge_count),
+            "components": int(row.components),
+        })
+    return results
+
+
+def run(path, output, workers=None, chunk_size=256, model_type="Hybrid", max_cycles=None,
+        progress_every=2.0):
+    """Analyze all snapshots under ``path`` and stream JSON lines to ``output``."""
+    workers = workers or os.cpu_count() or 1
+    # Keep a few chunks queued per worker so no core idles, without reading
+    # the whole corpus into memory.
+    max_pending = workers * 4
+    done = 0
+    start = last_report = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        chunks = iter_chunks(iter_snapshots(path), chunk_size)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(analyze_chunk, chunk, model_type, max_cycles))
+            if not pending:
+                break
+
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for result in future.result():
+                    output.write(json.dumps(result) + "\n")
+                    done += 1
+            output.flush()
+
+            now = time.monotonic()
+            if now - last_report >= progress_every:
+                last_report = now
+                print(f"\r{done} snapshots, {done / (now - start):.0f}/s",
+                      end="", file=sys.stderr, flush=True)
+
+    elapsed = time.monotonic() - start
+    print(f"\r✅ {done} snapshots in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.0f}/s)",
+          file=sys.stderr)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze RAG snapshots for deadlocks in parallel.")
+    parser.add_argument("path", help="Snapshot file or directory")
+    parser.add_argument("-o", "--output", help="Write JSON lines here (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=256, help="Snapshots per work unit")
+    parser.add_argument("-m", "--model", default="Hybrid",
+                        choices=["LSTM Neural Network", "Graph Neural Network", "Hybrid"])
+    parser.add_argument("--max-cycles", type=int, default=None,
+                        help="Enumerate up to this many cycles per snapshot (default: one per deadlocked group)")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            run(args.path, output, args.workers, args.chunk_size, args.model, args.max_cycles)
+    else:
+        run(args.path, sys.stdout, args.workers, args.chunk_size, args.model, args.max_cycles)
+
+
+if __name__ == "__main__":
+    main()
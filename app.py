@@ -3,6 +3,10 @@ import networkx as nx
 from src.deadlock import detect_deadlock, suggest_deadlock_solution
 from src.visualization import draw_graph
 
+# Limits that keep cycle enumeration responsive on dense graphs
+MAX_CYCLES = 100
+CYCLE_TIMEOUT = 2.0
+
 def parse_edges(edges_input):
     """Parses input edges in both 'a b, b c' and 'ab, bc' formats."""
     edges = []
@@ -26,6 +30,7 @@ def main():
     st.write("### Enter process-resource relationships:")
 
     edges_input = st.text_area("Enter edges (format: 'P1 R1, P2 R2' or 'P1R1, P2R2')", height=200)
+    witness_only = st.checkbox("Show one cycle per deadlocked group only", value=False)
 
     if st.button("Detect Deadlock"):
         if not edges_input.strip():
@@ -42,13 +47,20 @@ def main():
             return
 
         # Detect deadlock
-        deadlock_detected, cycles = detect_deadlock(edges)
+        deadlock_detected, cycles = detect_deadlock(edges,
+                                                    max_cycles=MAX_CYCLES,
+                                                    timeout=CYCLE_TIMEOUT,
+                                                    witness_only=witness_only)
 
         if deadlock_detected:
             st.error("⚠️ Deadlock detected!")
             # Display each cycle
             for idx, cycle in enumerate(cycles, start=1):
                 st.write(f"Cycle {idx}: {cycle}")
+            if not cycles:
+                st.write("No cycle found; the blocked processes wait on more instances than exist.")
+            if not witness_only and len(cycles) >= MAX_CYCLES:
+                st.warning(f"Showing the first {MAX_CYCLES} cycles only.")
             # Optionally, display a suggestion for resolution
             suggestion = suggest_deadlock_solution(cycles)
             if suggestion:
@@ -1,6 +1,18 @@
 import networkx as nx
 import random
 import pandas as pd
+import argparse
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from rag_corpus import CorpusWriter
+
+# Same size ranges as generate_synthetic_data
+MAX_PROCESSES = 6
+MAX_RESOURCES = 6
+MIN_EDGES, MAX_EDGES = 3, 10
+NODE_NAMES = ([f'P{i}' for i in range(1, MAX_PROCESSES + 1)] +
+              [f'R{i}' for i in range(1, MAX_RESOURCES + 1)])
 
 def generate_synthetic_data(samples=1000):
     data = []
@@ -30,8 +42,84 @@ def generate_synthetic_data(samples=1000):
     df = pd.DataFrame(data, columns=['Graph', 'Deadlock'])
     return df
 
+def sample_graph_batch(rng, samples):
+    """
+    Sample ``samples`` random RAGs at once with the distribution of generate_synthetic_data.
+    
+    :return: Tuple (counts, src, dst, labels) of int arrays; node ids index NODE_NAMES
+             and edges are grouped by graph.
+    """
+    num_processes = rng.integers(2, MAX_PROCESSES + 1, samples)
+    num_resources = rng.integers(2, MAX_RESOURCES + 1, samples)
+    num_edges = rng.integers(MIN_EDGES, MAX_EDGES + 1, samples)
+
+    graph = np.repeat(np.arange(samples), num_edges)
+    p = (rng.random(len(graph)) * num_processes[graph]).astype(np.int64)
+    r = MAX_PROCESSES + (rng.random(len(graph)) * num_resources[graph]).astype(np.int64)
+    request = rng.random(len(graph)) < 0.5
+    src = np.where(request, p, r)  # Process requests resource
+    dst = np.where(request, r, p)  # Resource assigned to process
+
+    # The dense adjacency stack drops repeated edges, as nx.DiGraph would
+    n = len(NODE_NAMES)
+    adjacency = np.zeros((samples, n, n), dtype=bool)
+    adjacency[graph, src, dst] = True
+    graph, src, dst = np.nonzero(adjacency)
+    counts = np.bincount(graph, minlength=samples)
+    return counts, src, dst, has_cycle_batch(adjacency).astype(np.int8)
+
+def has_cycle_batch(adjacency):
+    """
+    Cycle check for a stack of small graphs given as (batch, n, n) boolean adjacency.
+    
+    Runs Warshall's transitive closure on the whole stack at once; a graph has a
+    cycle iff some node reaches itself.
+    """
+    reach = adjacency.copy()
+    for k in range(adjacency.shape[1]):
+        reach |= reach[:, :, k:k + 1] & reach[:, k:k + 1, :]
+    return np.diagonal(reach, axis1=1, axis2=2).any(axis=1)
+
+def _generate_shard(directory, shard, samples, seed, batch_size):
+    """Worker: write one shard with its own deterministic random stream."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard,)))
+    path = os.path.join(directory, f"shard-{shard:05d}")
+    with CorpusWriter(path) as writer:
+        for start in range(0, samples, batch_size):
+            counts, src, dst, labels = sample_graph_batch(rng, min(batch_size, samples - start))
+            writer.append(counts, src, dst, labels, NODE_NAMES)
+    return path
+
+def generate_corpus(directory, samples, shard_size=1_000_000, workers=None, seed=0,
+                    batch_size=100_000):
+    """
+    Generate ``samples`` labeled graphs as binary corpus shards in ``directory``.
+    
+    Every shard draws from its own SeedSequence child, so the output depends
+    only on ``seed`` and ``shard_size`` and not on the number of workers.
+    
+    :return: List of shard directories (open each with rag_corpus.RAGCorpus).
+    """
+    os.makedirs(directory, exist_ok=True)
+    sizes = [min(shard_size, samples - start) for start in range(0, samples, shard_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_generate_shard, directory, shard, size, seed, batch_size)
+                   for shard, size in enumerate(sizes)]
+        return [future.result() for future in futures]
+
 # Generate data and save
 if __name__ == "__main__":
-    df = generate_synthetic_data(1000)
-    df.to_csv("deadlock_dataset.csv", index=False)
-    print("✅ Synthetic dataset created: deadlock_dataset.csv")
+    parser = argparse.ArgumentParser(description="Generate a synthetic deadlock dataset.")
+    parser.add_argument("samples", type=int, nargs="?", default=1000)
+    parser.add_argument("--corpus", help="Write binary corpus shards to this directory instead of CSV")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.corpus:
+        shards = generate_corpus(args.corpus, args.samples, workers=args.workers, seed=args.seed)
+        print(f"✅ Synthetic corpus created: {len(shards)} shards in {args.corpus}")
+    else:
+        df = generate_synthetic_data(args.samples)
+        df.to_csv("deadlock_dataset.csv", index=False)
+        print("✅ Synthetic dataset created: deadlock_dataset.csv")
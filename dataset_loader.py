@@ -0,0 +1,157 @@
+import csv
+import re
+import numpy as np
+
+# Matches one ('P1', 'R2') tuple of a repr'd edge list
+EDGE_PATTERN = re.compile(r"\(\s*['\"]([^'\"]*)['\"]\s*,\s*['\"]([^'\"]*)['\"]\s*\)")
+# Matches every quoted node name; used for whole-batch tokenizing
+NAME_PATTERN = re.compile(r"['\"]([^'\"]*)['\"]")
+
+
+class EdgeTable:
+    """
+    Flat edge table of a graph dataset.
+
+    ``graph_id``, ``src`` and ``dst`` are parallel int32 arrays with one entry per
+    edge, sorted by graph; node ids index into ``names``. ``labels`` holds the
+    Deadlock column (one entry per graph). Graph ids start at ``first_graph``,
+    which is non-zero for the batches streamed by iter_edge_tables.
+    """
+
+    def __init__(self, graph_id, src, dst, names, labels, first_graph=0):
+        self.graph_id = graph_id
+        self.src = src
+        self.dst = dst
+        self.names = names
+        self.labels = labels
+        self.first_graph = first_graph
+
+    @property
+    def num_graphs(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    def edge_counts(self):
+        """Number of edges in every graph."""
+        return np.bincount(self.graph_id - self.first_graph, minlength=self.num_graphs)
+
+    def offsets(self):
+        """CSR-style offsets: edges of graph i are rows offsets[i]:offsets[i+1]."""
+        offsets = np.zeros(self.num_graphs + 1, dtype=np.int64)
+        np.cumsum(self.edge_counts(), out=offsets[1:])
+        return offsets
+
+    def graph_edges(self, i):
+        """Edge tuples of the ``i``-th graph of the table."""
+        offsets = self.offsets()
+        lo, hi = offsets[i], offsets[i + 1]
+        names = self.names
+        return [(names[u], names[v]) for u, v in zip(self.src[lo:hi].tolist(), self.dst[lo:hi].tolist())]
+
+    def edge_lists(self):
+        """All graphs of the table as lists of edge tuples."""
+        names = self.names
+        edges = list(zip(map(names.__getitem__, self.src.tolist()),
+                         map(names.__getitem__, self.dst.tolist())))
+        offsets = self.offsets().tolist()
+        return [edges[lo:hi] for lo, hi in zip(offsets[:-1], offsets[1:])]
+
+
+def parse_edge_list(text):
+    """
+    Parse a repr'd edge list such as "[('P1', 'R1'), ('R1', 'P2')]".
+
+    :raises ValueError: if the text is not a bracketed list of edge tuples.
+    """
+    text = text.strip()
+    if not (text.startswith("[") and text.endswith("]")):
+        raise ValueError(f"Not an edge list: {text[:40]!r}")
+    edges = EDGE_PATTERN.findall(text)
+    if not edges and text[1:-1].strip():
+        raise ValueError(f"No edges found in: {text[:40]!r}")
+    return edges
+
+
+def load_edge_table(path, graph_column="Graph", label_column="Deadlock", batch_size=100_000):
+    """
+    Load a dataset CSV (like deadlock_dataset.csv) into an EdgeTable.
+
+    Rows are tokenized in batches with a compiled regex and node names are
+    interned with np.unique per batch, so no Python object is built per edge
+    beyond the regex match itself.
+    """
+    names = []
+    graph_ids, sources, targets, labels = [], [], [], []
+    for table in iter_edge_tables(path, graph_column, label_column, batch_size, names):
+        graph_ids.append(table.graph_id)
+        sources.append(table.src)
+        targets.append(table.dst)
+        labels.append(table.labels)
+
+    def concat(parts, dtype):
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+
+    return EdgeTable(concat(graph_ids, np.int32), concat(sources, np.int32),
+                     concat(targets, np.int32), names, concat(labels, np.int8))
+
+
+def iter_edge_tables(path, graph_column="Graph", label_column="Deadlock", batch_size=100_000,
+                     names=None):
+    """
+    Stream a dataset CSV as one EdgeTable per batch of rows.
+
+    Graph ids are global row numbers and all batches share (and extend) the
+    same ``names`` list, so node ids stay comparable across batches.
+    """
+    names = [] if names is None else names
+    vocab = {name: i for i, name in enumerate(names)}
+    rows_seen = 0
+
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        graph_col = header.index(graph_column)
+        label_col = header.index(label_column) if label_column in header else None
+
+        batch = []
+        for row in reader:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield _parse_batch(batch, rows_seen, graph_col, label_col, vocab, names)
+                rows_seen += len(batch)
+                batch = []
+        if batch:
+            yield _parse_batch(batch, rows_seen, graph_col, label_col, vocab, names)
+
+
+def _parse_batch(rows, first_id, graph_col, label_col, vocab, names):
+    cells = [row[graph_col] for row in rows]
+    # Each edge is one "(" tuple holding two quoted names, so one regex pass
+    # over the joined batch yields every endpoint in order.
+    counts = np.array([cell.count("(") for cell in cells], dtype=np.int64)
+    flat = NAME_PATTERN.findall("\n".join(cells))
+    if len(flat) != 2 * counts.sum():
+        raise ValueError(f"Malformed edge list near row {first_id}")
+
+    graph_id = np.repeat(np.arange(first_id, first_id + len(rows), dtype=np.int32), counts)
+    if label_col is not None:
+        labels = np.array([int(row[label_col]) for row in rows], dtype=np.int8)
+    else:
+        labels = np.zeros(len(rows), dtype=np.int8)
+    if not flat:
+        empty = np.zeros(0, dtype=np.int32)
+        return EdgeTable(graph_id, empty, empty, names, labels, first_id)
+
+    # Intern the batch vocabulary once, then map it onto the global ids
+    local, inverse = np.unique(np.array(flat), return_inverse=True)
+    mapping = np.empty(len(local), dtype=np.int32)
+    for i, name in enumerate(local.tolist()):
+        if name not in vocab:
+            vocab[name] = len(names)
+            names.append(name)
+        mapping[i] = vocab[name]
+    ids = mapping[inverse.reshape(-1)].reshape(-1, 2)
+    return EdgeTable(graph_id, ids[:, 0].copy(), ids[:, 1].copy(), names, labels, first_id)
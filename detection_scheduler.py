@@ -0,0 +1,94 @@
+import threading
+import time
+from src.incremental import IncrementalDeadlockDetector
+
+
+class DetectionScheduler:
+    """
+    Background cycle detection on a RealTimeMonitor with an adaptive interval.
+
+    Each tick consumes only the monitor's edge deltas through an
+    IncrementalDeadlockDetector, so an idle system costs one version check.
+    When the graph changed, the hybrid risk from prediction_engine sets how
+    soon the next check runs: high risk (or a live deadlock) drops straight
+    to ``min_interval``, while quiet periods back off by ``backoff`` per tick
+    up to ``max_interval``.
+    """
+
+    def __init__(self, monitor, predictor=None, min_interval=0.1, max_interval=5.0,
+                 backoff=1.5, model_type="Hybrid", on_deadlock=None):
+        self.monitor = monitor
+        self.predictor = predictor
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.model_type = model_type
+        self.on_deadlock = on_deadlock
+        self.interval = max_interval
+        self.detector = IncrementalDeadlockDetector()
+        self.version = 0
+        self.risk = 0.0
+        self.checks = 0
+        self.last_result = {"deadlock": False, "cycles": [], "risk": 0.0, "version": 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def run_once(self):
+        """One detection tick; returns the latest result."""
+        self.checks += 1
+        version, events = self.monitor.deltas_since(self.version)
+        if version == self.version:
+            self._relax(0.0)
+            return self.last_result
+
+        if events is None:
+            # Fell behind the event log: resync from the full snapshot
+            self.detector = IncrementalDeadlockDetector(self.monitor.snapshot().edges)
+            created = self.detector.cycles()
+        else:
+            created, _ = self.detector.apply_events(events)
+        self.version = version
+
+        deadlock = self.detector.has_deadlock()
+        if self.predictor is not None:
+            self.risk = float(self.predictor.predict(self.detector.edges(), self.model_type)["risk"])
+        else:
+            self.risk = 1.0 if deadlock else 0.0
+        self.last_result = {
+            "deadlock": deadlock,
+            "cycles": self.detector.cycles() if deadlock else [],
+            "new_cycles": created,
+            "risk": self.risk,
+            "version": version,
+            "checked_at": time.time(),
+        }
+        if created and self.on_deadlock is not None:
+            self.on_deadlock(self.last_result)
+        self._relax(1.0 if deadlock else self.risk)
+        return self.last_result
+
+    def _relax(self, risk):
+        """Tighten immediately when risk rises, back off gradually when it falls."""
+        target = self.max_interval - (self.max_interval - self.min_interval) * risk
+        if target < self.interval:
+            self.interval = target
+        else:
+            self.interval = min(target, self.interval * self.backoff)
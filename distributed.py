@@ -0,0 +1,321 @@
+"""
+Distributed deadlock detection across several monitor nodes.
+
+Every node keeps its own wait-for graph (a RealTimeMonitor). Detection runs in
+two rounds driven by a Coordinator:
+
+1. Each node reports its node labels; labels seen on two or more nodes are the
+   boundary through which a global cycle must pass.
+2. Each node compresses its graph to "boundary u reaches boundary v" pairs and
+   reports them together with its purely local cycles.
+
+The coordinator searches each strongly connected component of the small union
+of these summaries for a cycle that uses pairs from at least two nodes, and
+asks the owning nodes to expand each summary edge back into a real path, so no
+full graph ever leaves its node.
+
+Try it with three local processes:
+    python distributed.py
+"""
+from collections import deque
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+import networkx as nx
+from realtime import RealTimeMonitor
+from src.deadlock import witness_cycles
+
+AUTHKEY = b"deadlock-detect"
+
+
+class LocalDetector:
+    """Node-side view of one host's wait-for graph."""
+
+    def __init__(self, monitor=None, edges=()):
+        self.monitor = monitor or RealTimeMonitor()
+        if edges:
+            self.monitor.replace(edges)
+
+    def _adjacency(self):
+        succ = {}
+        for u, v in self.monitor.snapshot().edges:
+            succ.setdefault(u, []).append(v)
+            succ.setdefault(v, [])
+        return succ
+
+    def node_names(self):
+        return sorted(self._adjacency())
+
+    def local_cycles(self):
+        """One witness cycle per deadlocked component of the local graph."""
+        return list(witness_cycles(list(self.monitor.snapshot().edges)))
+
+    def summary(self, boundary):
+        """Pairs (u, v) of distinct boundary nodes where u reaches v locally."""
+        succ = self._adjacency()
+        boundary = set(boundary) & set(succ)
+        pairs = []
+        for source in boundary:
+            seen = {source}
+            queue = deque(succ[source])
+            while queue:
+                node = queue.popleft()
+                if node in seen:
+                    continue
+                seen.add(node)
+                if node in boundary:
+                    pairs.append((source, node))
+                queue.extend(succ[node])
+        return pairs
+
+    def expand(self, source, target):
+        """Shortest local path source -> target (both ends included)."""
+        succ = self._adjacency()
+        parent = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                break
+            for nxt in succ.get(node, ()):
+                if nxt not in parent:
+                    parent[nxt] = node
+                    queue.append(nxt)
+        path, node = [], target
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        return path[::-1]
+
+    def handle(self, message):
+        """Dispatch one coordinator request."""
+        kind = message[0]
+        if kind == "names":
+            return self.node_names()
+        if kind == "summary":
+            return {"pairs": self.summary(message[1]), "local_cycles": self.local_cycles()}
+        if kind == "expand":
+            return self.expand(message[1], message[2])
+        if kind == "update":
+            return self.monitor.apply(message[1])
+        raise ValueError(f"Unknown request: {kind}")
+
+
+def serve_node(address, edges=(), authkey=AUTHKEY):
+    """Process entry point: answer coordinator requests until told to stop."""
+    detector = LocalDetector(edges=edges)
+    with Listener(address, authkey=authkey) as listener:
+        while True:
+            with listener.accept() as conn:
+                while True:
+                    try:
+                        message = conn.recv()
+                    except EOFError:
+                        break
+                    if message[0] == "stop":
+                        conn.send(True)
+                        return
+                    try:
+                        conn.send(("ok", detector.handle(message)))
+                    except Exception as e:
+                        conn.send(("error", str(e)))
+
+
+class Coordinator:
+    """Collects node summaries and finds cycles that span nodes."""
+
+    def __init__(self, addresses, authkey=AUTHKEY):
+        self.addresses = list(addresses)
+        self.authkey = authkey
+        self._conns = {}
+
+    def _call(self, node, *message):
+        conn = self._conns.get(node)
+        if conn is None:
+            conn = self._conns[node] = Client(self.addresses[node], authkey=self.authkey)
+        conn.send(message)
+        status, result = conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Node {node}: {result}")
+        return result
+
+    def update(self, node, events):
+        """Forward (op, edge) events to one node's monitor."""
+        return self._call(node, "update", events)
+
+    def detect(self):
+        """
+        Run one detection round.
+
+        :return: Dict with "local" (node -> witness cycles), "global" (cycles
+                 spanning nodes) and "summary_edges" (pairs shipped in round 2).
+        """
+        nodes = range(len(self.addresses))
+        names = {node: set(self._call(node, "names")) for node in nodes}
+        seen_on = {}
+        for node in nodes:
+            for name in names[node]:
+                seen_on[name] = seen_on.get(name, 0) + 1
+        shared = {name for name, count in seen_on.items() if count > 1}
+
+        summary = nx.DiGraph()
+        owners = {}  # (u, v) -> nodes on which u reaches v
+        local = {}
+        for node in nodes:
+            report = self._call(node, "summary", sorted(names[node] & shared))
+            local[node] = report["local_cycles"]
+            for u, v in report["pairs"]:
+                summary.add_edge(u, v)
+                owners.setdefault((u, v), set()).add(node)
+
+        global_cycles = []
+        for component in nx.strongly_connected_components(summary):
+            if len(component) < 2:
+                continue
+            hops = _crossing_cycle(summary.subgraph(component), owners)
+            if hops is None:
+                continue  # Every cycle lies within one node, already in its local cycles
+            path = []
+            for (u, v), node in hops:
+                path.extend(self._call(node, "expand", u, v)[:-1])
+            global_cycles.append(path)
+        return {"local": local, "global": global_cycles,
+                "summary_edges": summary.number_of_edges()}
+
+    def shutdown(self):
+        """Stop every node process."""
+        for node in range(len(self.addresses)):
+            conn = self._conns.pop(node, None) or Client(self.addresses[node], authkey=self.authkey)
+            conn.send(("stop",))
+            conn.recv()
+            conn.close()
+
+    def close(self):
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+
+
+def _crossing_cycle(scc, owners):
+    """
+    A simple cycle in a summary SCC whose hops come from at least two nodes.
+
+    For every hop u -> v and owner of it, a BFS over (node, crossed) states
+    looks for a walk back from v to u that uses a hop another node owns. The
+    walk is split into simple cycles and the first one that still spans nodes
+    is returned.
+
+    :return: List of ((u, v), owner) hops, or None if every cycle is local.
+    """
+    for u, v in scc.edges():
+        for first in sorted(owners[(u, v)]):
+            walk = _crossing_walk(scc, owners, v, u, first)
+            if walk is None:
+                continue
+            for cycle in _split_walk([u] + walk[:-1]):
+                hops = _assign_owners(list(zip(cycle, cycle[1:] + cycle[:1])), owners)
+                if hops is not None:
+                    return hops
+    return None
+
+
+def _crossing_walk(scc, owners, source, target, first):
+    """Shortest walk source -> target using a hop not owned by ``first`` only."""
+    start = (source, False)
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        node, crossed = state
+        if node == target and crossed:
+            walk = []
+            while state is not None:
+                walk.append(state[0])
+                state = parent[state]
+            return walk[::-1]
+        for nxt in scc.successors(node):
+            following = (nxt, crossed or bool(owners[(node, nxt)] - {first}))
+            if following not in parent:
+                parent[following] = state
+                queue.append(following)
+    return None
+
+
+def _split_walk(walk):
+    """Simple cycles of the closed walk walk[0] -> ... -> walk[-1] -> walk[0]."""
+    stack = []
+    position = {}
+    for node in walk:
+        if node in position:
+            start = position[node]
+            yield stack[start:]
+            for dropped in stack[start + 1:]:
+                del position[dropped]
+            del stack[start + 1:]
+        else:
+            position[node] = len(stack)
+            stack.append(node)
+    yield stack
+
+
+def _assign_owners(hops, owners):
+    """Pick one owner per hop so at least two nodes are used, or None if impossible."""
+    sets = [owners[hop] for hop in hops]
+    if len(set().union(*sets)) < 2:
+        return None
+    single = [next(iter(s)) for s in sets if len(s) == 1]
+    anchor = single[0] if single else min(sets[0])
+    chosen = [anchor if anchor in s else min(s) for s in sets]
+    if len(set(chosen)) < 2:
+        # Some hop can also be served by another node; the anchor stays in use elsewhere
+        i = next(i for i, s in enumerate(sets) if s - {anchor})
+        chosen[i] = min(sets[i] - {anchor})
+    return list(zip(hops, chosen))
+
+
+def spawn_local_cluster(partitions, host="127.0.0.1", base_port=0):
+    """Start one node process per edge partition; returns (processes, addresses)."""
+    import socket
+    addresses = []
+    for i in range(len(partitions)):
+        if base_port:
+            port = base_port + i
+        else:
+            with socket.socket() as s:
+                s.bind((host, 0))
+                port = s.getsockname()[1]
+        addresses.append((host, port))
+    processes = [Process(target=serve_node, args=(address, edges), daemon=True)
+                 for address, edges in zip(addresses, partitions)]
+    for process in processes:
+        process.start()
+    return processes, addresses
+
+
+def _connect(coordinator, retries=50):
+    import time
+    for node in range(len(coordinator.addresses)):
+        for _ in range(retries):
+            try:
+                coordinator._call(node, "names")
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.1)
+
+
+if __name__ == "__main__":
+    # P1 -> R1 -> P2 lives on node 0, P2 -> R2 -> P3 on node 1, P3 -> R3 -> P1 on node 2
+    partitions = [
+        [("P1", "R1"), ("R1", "P2"), ("P4", "R4")],
+        [("P2", "R2"), ("R2", "P3"), ("R5", "P5"), ("P5", "R5")],
+        [("P3", "R3"), ("R3", "P1")],
+    ]
+    processes, addresses = spawn_local_cluster(partitions)
+    coordinator = Coordinator(addresses)
+    _connect(coordinator)
+    result = coordinator.detect()
+    print("Local cycles:", result["local"])
+    print("Cross-node cycles:", result["global"])
+    print("Summary edges shipped:", result["summary_edges"])
+    coordinator.shutdown()
+    for process in processes:
+        process.join()
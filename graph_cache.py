@@ -0,0 +1,96 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_edges(edges):
+    """Deduplicated, sorted edge list with whitespace-trimmed string labels."""
+    return sorted({(str(u).strip(), str(v).strip()) for u, v in edges})
+
+
+def graph_fingerprint(edges, *extra):
+    """
+    Canonical hash of a graph state.
+
+    Independent of edge order, duplicate edges and label whitespace, so the same
+    system state always maps to the same key. ``extra`` values (e.g. the model
+    type) are mixed into the key.
+    """
+    digest = hashlib.sha1()
+    for u, v in normalize_edges(edges):
+        digest.update(f"{u}\x1f{v}\x1e".encode())
+    for value in extra:
+        digest.update(f"\x1d{value}".encode())
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with a size bound, per-entry TTL and hit/miss counters."""
+
+    def __init__(self, maxsize=128, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+# Shared caches; module state survives Streamlit reruns
+prediction_cache = LRUCache(maxsize=256, ttl=600.0)
+render_cache = LRUCache(maxsize=64, ttl=600.0)
+
+
+def cached_predict(predictor, edges, model_type):
+    """predictor.predict (risk and cycle analysis) memoized by graph fingerprint."""
+    key = graph_fingerprint(edges, model_type)
+    return prediction_cache.get_or_compute(key, lambda: predictor.predict(edges, model_type))
+
+
+def cached_render(render, edges, *args):
+    """Rendered graph HTML memoized by graph fingerprint."""
+    key = graph_fingerprint(edges, render.__name__, *args)
+    return render_cache.get_or_compute(key, lambda: render(edges, *args))
+
+
+def cache_stats():
+    return {"prediction": prediction_cache.stats(), "render": render_cache.stats()}
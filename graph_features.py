@@ -0,0 +1,154 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from dataset_loader import EdgeTable, load_edge_table
+from rag_corpus import RAGCorpus
+from src.rag import CompactRAG, PROCESS, RESOURCE, node_kind
+
+# Bump when the feature definitions change so stale caches are ignored
+FEATURE_VERSION = 1
+CACHE_DIR = ".feature_cache"
+
+FEATURE_COLUMNS = [
+    "edge_count", "node_count", "process_count", "resource_count", "density",
+    "out_degree_mean", "out_degree_max", "out_degree_std",
+    "in_degree_mean", "in_degree_max", "in_degree_std",
+    "request_edges", "assignment_edges", "request_ratio",
+    "waiting_processes", "holding_processes", "hold_and_wait",
+    "contended_resources", "scc_count", "largest_scc", "cyclic_nodes",
+]
+
+
+def extract_features(table):
+    """
+    Compute structural features for every graph of an EdgeTable in one pass.
+
+    All graphs are treated as one disjoint union: each (graph, node) pair gets
+    its own id, so degree statistics are bincounts and a single SCC pass
+    covers every graph.
+
+    :return: DataFrame with one row per graph and FEATURE_COLUMNS as columns.
+    """
+    count = table.num_graphs
+    graph_of_edge = table.graph_id.astype(np.int64) - table.first_graph
+    vocab = max(len(table.names), 1)
+
+    # Intern (graph, node) pairs; ids come out sorted by graph
+    keys = np.concatenate([graph_of_edge * vocab + table.src, graph_of_edge * vocab + table.dst])
+    pairs, inverse = np.unique(keys, return_inverse=True)
+    node_graph, node_label = np.divmod(pairs, vocab)
+    src = inverse[:len(table.src)]
+    dst = inverse[len(table.src):]
+    n = len(pairs)
+
+    kinds = np.array([node_kind(name) for name in table.names], dtype=np.uint8)
+    node_kinds = kinds[node_label] if n else np.zeros(0, dtype=np.uint8)
+    is_process = (node_kinds & PROCESS) > 0
+    is_resource = (node_kinds & RESOURCE) > 0
+
+    out_degree = np.bincount(src, minlength=n)
+    in_degree = np.bincount(dst, minlength=n)
+    per_graph = lambda weights=None: np.bincount(node_graph, weights, minlength=count)
+
+    edges = np.bincount(graph_of_edge, minlength=count)
+    nodes = per_graph()
+    safe_nodes = np.maximum(nodes, 1)
+    request = is_process[src] & is_resource[dst] if n else np.zeros(0, dtype=bool)
+    assignment = is_resource[src] & is_process[dst] if n else np.zeros(0, dtype=bool)
+    requests = np.bincount(graph_of_edge[request], minlength=count)
+    assignments = np.bincount(graph_of_edge[assignment], minlength=count)
+
+    features = {
+        "edge_count": edges,
+        "node_count": nodes,
+        "process_count": per_graph(is_process),
+        "resource_count": per_graph(is_resource),
+        "density": edges / np.maximum(nodes * (nodes - 1), 1),
+    }
+    for name, degree in (("out", out_degree), ("in", in_degree)):
+        mean = per_graph(degree) / safe_nodes
+        square = per_graph(degree.astype(np.float64) ** 2) / safe_nodes
+        peak = np.zeros(count, dtype=np.int64)
+        np.maximum.at(peak, node_graph, degree)
+        features[f"{name}_degree_mean"] = mean
+        features[f"{name}_degree_max"] = peak
+        features[f"{name}_degree_std"] = np.sqrt(np.maximum(square - mean ** 2, 0))
+
+    # A process waits on its P->R edges and holds the resources on its R->P edges
+    waiting = np.bincount(src[request], minlength=n) > 0
+    holding = np.bincount(dst[assignment], minlength=n) > 0
+    contended = is_resource & (np.bincount(dst[request], minlength=n) > 1)
+    features.update({
+        "request_edges": requests,
+        "assignment_edges": assignments,
+        "request_ratio": requests / np.maximum(requests + assignments, 1),
+        "waiting_processes": per_graph(waiting),
+        "holding_processes": per_graph(holding),
+        "hold_and_wait": per_graph(waiting & holding),
+        "contended_resources": per_graph(contended),
+    })
+
+    rag = CompactRAG.from_arrays(src, dst, [None] * n)
+    scc_count, labels = rag.strongly_connected_components()
+    sizes = np.bincount(labels, minlength=scc_count)
+    scc_graph = np.zeros(scc_count, dtype=np.int64)
+    scc_graph[labels] = node_graph
+    largest = np.zeros(count, dtype=np.int64)
+    np.maximum.at(largest, scc_graph, sizes)
+    cyclic = np.zeros(scc_count, dtype=bool)
+    cyclic[rag.cyclic_components(labels)] = True
+    features.update({
+        "scc_count": np.bincount(scc_graph, minlength=count),
+        "largest_scc": largest,
+        "cyclic_nodes": per_graph(cyclic[labels]),
+    })
+
+    return pd.DataFrame({column: features[column] for column in FEATURE_COLUMNS})
+
+
+def edge_list_features(edges):
+    """Features of a single edge list, e.g. for predicting on user input."""
+    rag = CompactRAG.from_edges(edges)
+    src, dst = rag.edge_arrays()
+    table = EdgeTable(np.zeros(len(src), dtype=np.int32), src, dst, rag.names,
+                      np.zeros(1, dtype=np.int8))
+    return extract_features(table)
+
+
+def dataset_hash(path):
+    """SHA-256 of a dataset CSV or of the column files of a corpus directory."""
+    digest = hashlib.sha256(f"features-v{FEATURE_VERSION}".encode())
+    files = [path]
+    if os.path.isdir(path):
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+    for name in files:
+        with open(name, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def load_features(path, cache_dir=CACHE_DIR):
+    """
+    Return (features, labels) for a dataset CSV or corpus directory.
+
+    The feature matrix is cached in ``cache_dir`` under the dataset hash, so
+    retraining on an unchanged dataset skips parsing and extraction.
+    """
+    cache_path = os.path.join(cache_dir, f"{dataset_hash(path)}.npz")
+    if os.path.exists(cache_path):
+        cached = np.load(cache_path)
+        features = pd.DataFrame({column: cached[column] for column in FEATURE_COLUMNS})
+        return features, cached["__labels__"]
+
+    if os.path.isdir(path):
+        table = RAGCorpus(path).edge_table()
+    else:
+        table = load_edge_table(path)
+    features = extract_features(table)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(cache_path, __labels__=table.labels,
+             **{column: features[column].to_numpy() for column in FEATURE_COLUMNS})
+    return features, table.labels
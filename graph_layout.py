@@ -0,0 +1,203 @@
+"""
+Server-side node layout for resource allocation graphs.
+
+Two vectorized layouts over CompactRAG int arrays:
+
+* ``force_layout``: Fruchterman-Reingold with the all-pairs repulsion done in
+  NumPy blocks, for graphs up to FORCE_NODE_LIMIT nodes.
+* ``bipartite_layout``: processes on one row, resources on another, ordered by
+  barycenter sweeps; O(edges) per sweep, used for larger graphs.
+
+``layout_positions`` caches results per graph fingerprint. When a graph is new
+but most of its nodes were in the previous layout, the nodes that already had
+a position are pinned in the previous layout's frame: the force layout only
+relaxes the new nodes and their neighbours, the bipartite one only places the
+new nodes. Small edits therefore do not make the drawing jump.
+"""
+import numpy as np
+from graph_cache import LRUCache, graph_fingerprint
+from src.rag import CompactRAG, PROCESS, RESOURCE
+
+FORCE_NODE_LIMIT = 500
+_BLOCK_PAIRS = 1 << 21
+
+layout_cache = LRUCache(maxsize=64, ttl=600.0)
+_previous = {}  # method -> positions of the most recent layout
+
+
+def force_layout(graph, initial=None, iterations=50, temperature=0.1, seed=0, movable=None):
+    """
+    Fruchterman-Reingold layout.
+
+    :param graph: CompactRAG.
+    :param initial: Optional (n, 2) start positions; NaN rows are placed randomly.
+    :param movable: Optional boolean mask of nodes to relax. The others keep
+                    their start positions and the result is not rescaled.
+    :return: (n, 2) float array in [-1, 1].
+    """
+    n = graph.num_nodes
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, (n, 2))
+    if initial is not None:
+        known = ~np.isnan(initial[:, 0])
+        pos[known] = initial[known]
+    if n < 2:
+        return pos
+    active = np.arange(n) if movable is None else np.flatnonzero(movable)
+    src, dst = graph.edge_arrays()
+    src = src.astype(np.intp)
+    dst = dst.astype(np.intp)
+    k2 = 4.0 / n
+    block = max(1, _BLOCK_PAIRS // n)
+    cooling = (0.01 / temperature) ** (1.0 / max(iterations, 1)) if temperature > 0.01 else 1.0
+    for _ in range(iterations):
+        # Repulsion sum_j (p_i - p_j) * k^2 / |p_i - p_j|^2, as matrix products
+        disp = np.zeros_like(pos)
+        sq = (pos ** 2).sum(1)
+        for start in range(0, len(active), block):
+            rows = active[start:start + block]
+            part = pos[rows]
+            dist2 = sq[rows, None] + sq[None, :] - 2.0 * (part @ pos.T)
+            weight = k2 / np.maximum(dist2, 1e-6)
+            weight[np.arange(len(rows)), rows] = 0.0
+            disp[rows] = part * weight.sum(1)[:, None] - weight @ pos
+        delta = pos[src] - pos[dst]
+        pull = delta * (np.sqrt((delta ** 2).sum(-1)) / np.sqrt(k2))[:, None]
+        np.add.at(disp, src, -pull)
+        np.add.at(disp, dst, pull)
+        disp = disp[active]
+        length = np.maximum(np.sqrt((disp ** 2).sum(-1)), 1e-9)
+        pos[active] += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature *= cooling
+    if movable is None:
+        return _normalize(pos)
+    return np.clip(pos, -1.0, 1.0)
+
+
+def bipartite_layout(graph, initial=None, sweeps=4):
+    """
+    Two-row layout: processes at y=-1, resources at y=1, other nodes at y=0.
+
+    Each sweep moves every node to the mean x of its neighbours and re-spreads
+    each row evenly, which untangles crossings like a layered layout.
+    """
+    n = graph.num_nodes
+    y = np.zeros(n)
+    y[(graph.kind & PROCESS) > 0] = -1.0
+    y[(graph.kind & RESOURCE) > 0] = 1.0
+    x = np.arange(n, dtype=float)
+    if initial is not None:
+        known = ~np.isnan(initial[:, 0])
+        x[known] = initial[known, 0] * n
+    rows = [np.flatnonzero(y == level) for level in (-1.0, 0.0, 1.0)]
+    src, dst = graph.edge_arrays()
+    ends = np.concatenate([src, dst])
+    others = np.concatenate([dst, src])
+    degree = np.bincount(ends, minlength=n)
+    for _ in range(sweeps):
+        x = _spread(x, rows)
+        total = np.bincount(ends, weights=x[others], minlength=n)
+        x = np.where(degree > 0, total / np.maximum(degree, 1), x)
+    x = _spread(x, rows)
+    return _normalize(np.column_stack([x, y]), keep_y=True)
+
+
+def _spread(x, rows):
+    """Evenly space each row in the order given by x."""
+    out = np.empty_like(x)
+    for row in rows:
+        if len(row):
+            order = row[np.argsort(x[row], kind="stable")]
+            out[order] = np.linspace(-1, 1, len(row)) if len(row) > 1 else 0.0
+    return out
+
+
+def _normalize(pos, keep_y=False):
+    pos = pos - pos.mean(0)
+    scale = np.abs(pos).max(0)
+    scale[scale == 0] = 1.0
+    if keep_y:
+        scale[1] = 1.0
+    return pos / scale
+
+
+def compute_layout(edges, method="auto", previous=None):
+    """
+    Lay out a graph, warm-starting from ``previous`` (label -> (x, y)) if given.
+
+    :param method: "force", "bipartite" or "auto" (force up to FORCE_NODE_LIMIT nodes).
+    :return: Dict of node label -> (x, y) in [-1, 1].
+    """
+    graph = CompactRAG.from_edges(edges)
+    n = graph.num_nodes
+    if method == "auto":
+        method = "force" if n <= FORCE_NODE_LIMIT else "bipartite"
+    initial = None
+    warm = False
+    if previous:
+        initial = np.full((n, 2), np.nan)
+        for i, name in enumerate(graph.names):
+            if name in previous:
+                initial[i] = previous[name]
+        placed = ~np.isnan(initial[:, 0])
+        warm = placed.sum() * 2 >= n
+        if warm:
+            _place_new_nodes(graph, initial, placed)
+    if method == "force":
+        if warm:
+            pos = force_layout(graph, initial, iterations=15, temperature=0.02,
+                               movable=_near_new_nodes(graph, placed))
+        else:
+            pos = force_layout(graph)
+    elif method == "bipartite":
+        pos = _extend_bipartite(graph, initial, placed) if warm else bipartite_layout(graph)
+    else:
+        raise ValueError(f"Unknown layout method: {method}")
+    return {name: (float(x), float(y)) for name, (x, y) in zip(graph.names, pos.tolist())}
+
+
+def _place_new_nodes(graph, initial, placed):
+    """Put each new node at the mean of its already placed neighbours."""
+    src, dst = graph.edge_arrays()
+    ends = np.concatenate([src, dst])
+    others = np.concatenate([dst, src])
+    usable = placed[others]
+    count = np.bincount(ends[usable], minlength=graph.num_nodes)
+    for axis in range(2):
+        total = np.bincount(ends[usable], weights=initial[others[usable], axis], minlength=graph.num_nodes)
+        fresh = ~placed & (count > 0)
+        initial[fresh, axis] = total[fresh] / count[fresh] + np.random.default_rng(axis).normal(0, 0.02, fresh.sum())
+
+
+def _extend_bipartite(graph, initial, placed):
+    """Keep placed nodes where they were and put new ones on their row."""
+    pos = initial.copy()
+    fresh = ~placed
+    y = np.zeros(graph.num_nodes)
+    y[(graph.kind & PROCESS) > 0] = -1.0
+    y[(graph.kind & RESOURCE) > 0] = 1.0
+    pos[fresh, 1] = y[fresh]
+    isolated = np.isnan(pos[:, 0])
+    pos[isolated, 0] = np.random.default_rng(0).uniform(-1, 1, isolated.sum())
+    return np.clip(pos, -1.0, 1.0)
+
+
+def _near_new_nodes(graph, placed):
+    """Mask of nodes without a previous position and their direct neighbours."""
+    src, dst = graph.edge_arrays()
+    near = ~placed
+    touched = near[src] | near[dst]
+    near[src[touched]] = True
+    near[dst[touched]] = True
+    return near
+
+
+def layout_positions(edges, method="auto"):
+    """compute_layout memoized by graph fingerprint, warm-started from the last layout."""
+    key = graph_fingerprint(edges, "layout", method)
+    positions = layout_cache.get(key)
+    if positions is None:
+        positions = compute_layout(edges, method, _previous.get(method))
+        layout_cache.put(key, positions)
+    _previous[method] = positions
+    return positions
@@ -0,0 +1,133 @@
+"""
+Level-of-detail views of large resource allocation graphs.
+
+Nodes on a cycle (and, optionally, nodes whose risk is above a threshold) are
+always shown as themselves. Everything else is grouped into regions, the weakly
+connected pieces left once those nodes are taken out, and each region is drawn
+as one super-node unless it is expanded. Small regions are expanded
+automatically while the view stays within the node budget.
+
+Region ids are "region:<smallest member label>", so they stay stable across
+reruns and can be passed back in ``expanded``.
+"""
+import numpy as np
+from src.rag import CompactRAG
+
+REGION_PREFIX = "region:"
+
+
+class LODView:
+    """Display graph produced by level_of_detail()."""
+
+    def __init__(self, nodes, edges, weights, members, detail):
+        self.nodes = nodes        # Displayed node labels and region ids
+        self.edges = edges        # Display edges between them
+        self.weights = weights    # Display edge -> number of underlying edges
+        self.members = members    # Collapsed region id -> member labels
+        self.detail = detail      # Labels shown in full because they are on a cycle or risky
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    def label(self, node):
+        """Display label: the node itself, or a short summary of a region."""
+        members = self.members.get(node)
+        if members is None:
+            return str(node)
+        return f"{members[0]} +{len(members) - 1}"
+
+
+def level_of_detail(edges, node_budget=300, expanded=(), risk=None, risk_threshold=0.5):
+    """
+    Collapse acyclic, low-risk parts of a graph into region super-nodes.
+
+    :param edges: List of (source, target) tuples.
+    :param node_budget: Target node count of the view; cycle nodes are shown even beyond it.
+    :param expanded: Region ids the user asked to see in full.
+    :param risk: Optional dict of node label -> risk in [0, 1].
+    :param risk_threshold: Nodes at or above this risk are never collapsed.
+    :return: LODView.
+    """
+    graph = CompactRAG.from_edges(edges)
+    names = graph.names
+    n = graph.num_nodes
+    _, labels = graph.strongly_connected_components()
+    keep = np.isin(labels, graph.cyclic_components(labels))
+    for name, value in (risk or {}).items():
+        if value >= risk_threshold and name in graph.index:
+            keep[graph.index[name]] = True
+    detail = {names[i] for i in np.flatnonzero(keep).tolist()}
+
+    # Regions: weakly connected components of the remaining nodes, found as
+    # the SCCs of their edges taken in both directions
+    src, dst = graph.edge_arrays()
+    inner = ~keep[src] & ~keep[dst]
+    s, d = src[inner], dst[inner]
+    undirected = CompactRAG.from_arrays(np.concatenate([s, d]), np.concatenate([d, s]), names)
+    _, region = undirected.strongly_connected_components()
+
+    groups = {}
+    for i in np.flatnonzero(~keep).tolist():
+        groups.setdefault(int(region[i]), []).append(i)
+
+    # Too many regions for the budget: pool the smallest ones that do not
+    # touch a detailed node, since nothing is lost by drawing them together,
+    # then pool the regions hanging off each detailed node into one per anchor
+    slots = max(node_budget - int(keep.sum()), 1)
+    if len(groups) > slots:
+        boundary = keep[src] != keep[dst]
+        outside = np.concatenate([src[boundary & ~keep[src]], dst[boundary & ~keep[dst]]])
+        inside = np.concatenate([dst[boundary & ~keep[src]], src[boundary & ~keep[dst]]])
+        anchor = {}
+        for label, node in zip(region[outside].tolist(), inside.tolist()):
+            anchor[label] = min(anchor.get(label, node), node)
+        loose = sorted((label for label in groups if label not in anchor), key=lambda label: len(groups[label]))
+        _pool(groups, loose[:len(groups) - slots + 1])
+        by_anchor = {}
+        for label, node in anchor.items():
+            by_anchor.setdefault(node, []).append(label)
+        for node in sorted(by_anchor, key=lambda node: -len(by_anchor[node])):
+            if len(groups) <= slots:
+                break
+            _pool(groups, by_anchor[node])
+
+    region_ids = {}
+    for label, group in groups.items():
+        group.sort(key=lambda i: str(names[i]))
+        region_ids[label] = REGION_PREFIX + str(names[group[0]])
+
+    expanded = set(expanded)
+    open_regions = {label for label, group in groups.items()
+                    if len(group) == 1 or region_ids[label] in expanded}
+    shown = int(keep.sum()) + len(groups) + sum(len(groups[label]) - 1 for label in open_regions)
+    for label in sorted(groups, key=lambda label: len(groups[label])):
+        cost = len(groups[label]) - 1
+        if label not in open_regions and shown + cost <= node_budget:
+            open_regions.add(label)
+            shown += cost
+
+    # Display id per node: itself, or n + its collapsed region's slot
+    display = np.arange(n)
+    display_names = list(names)
+    members = {}
+    for label, group in groups.items():
+        if label in open_regions:
+            continue
+        display[group] = len(display_names)
+        display_names.append(region_ids[label])
+        members[region_ids[label]] = [names[i] for i in group]
+
+    shown_nodes = [names[i] for i in range(n) if display[i] == i] + list(members)
+    du, dv = display[src], display[dst]
+    visible = (du != dv) | (du < n)
+    keys, counts = np.unique(du[visible] * len(display_names) + dv[visible], return_counts=True)
+    pairs = np.divmod(keys, len(display_names))
+    view_edges = [(display_names[u], display_names[v]) for u, v in zip(pairs[0].tolist(), pairs[1].tolist())]
+    return LODView(shown_nodes, view_edges, dict(zip(view_edges, counts.tolist())), members, detail)
+
+
+def _pool(groups, labels):
+    """Merge the groups under ``labels`` into the first one."""
+    for label in labels[1:]:
+        groups[labels[0]].extend(groups.pop(label))
@@ -1,56 +1,48 @@
+from graph_layout import layout_positions
+from graph_lod import level_of_detail
+from vis_assets import compact_json, cycle_edges, graph_payload, network_html
+
+GRAPH_OPTIONS = compact_json({
+    "nodes": {
+        "shape": "box",
+        "font": {"size": 16},
+        "color": {
+            "background": "#FFFFFF",
+            "border": "#000000",
+            "highlight": {"background": "#FFFFFF", "border": "#FF0000"},
+        },
+    },
+    "groups": {
+        "process": {"color": "#00BFFF"},
+        "resource": {"color": "#FFA500"},
+        "region": {"color": "#D3D3D3", "shape": "ellipse"},
+    },
+    "edges": {
+        "arrows": "to",
+        "color": "#000000",
+        "smooth": {"type": "cubic"},
+        "width": 2,
+    },
+    "physics": False,
+})
+
+
+def _group(node):
+    return "process" if 'P' in node else "resource"
+
+
+def _lod_group(view):
+    return lambda node: "region" if node in view.members else _group(node)
+
+
 def render_interactive_graph(edges, cycle=None):
-    nodes = set()
-    for edge in edges:
-        nodes.add(edge[0])
-        nodes.add(edge[1])
-    
-    node_list = [{"id": n, "label": n, "color": "#00BFFF" if 'P' in n else "#FFA500"} 
-                for n in nodes]
-    
-    edge_list = []
-    for edge in edges:
-        edge_data = {
-            "from": edge[0],
-            "to": edge[1],
-            "color": "#FF0000" if cycle and edge in cycle else "#000000",
-            "arrows": "to"
-        }
-        edge_list.append(edge_data)
-    
-    return f"""
-    <html>
-    <head>
-      <script type="text/javascript" src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
-      <style>
-        #network-container {{ width: 100%; height: 600px; border: 1px solid #ddd; }}
-      </style>
-    </head>
-    <body>
-      <div id="network-container"></div>
-      <script>
-        var nodes = new vis.DataSet({node_list});
-        var edges = new vis.DataSet({edge_list});
-        var container = document.getElementById("network-container");
-        var data = {{ nodes: nodes, edges: edges }};
-        var options = {{
-          nodes: {{ 
-            shape: "box",
-            font: {{ size: 16 }},
-            color: {{
-              background: "#FFFFFF",
-              border: "#000000",
-              highlight: {{ background: "#FFFFFF", border: "#FF0000" }}
-            }}
-          }},
-          edges: {{ 
-            arrows: "to",
-            smooth: {{ type: "cubic" }},
-            width: 2
-          }},
-          physics: {{ stabilization: true }}
-        }};
-        new vis.Network(container, data, options);
-      </script>
-    </body>
-    </html>
-    """
\ No newline at end of file
+    payload = graph_payload(edges, _group, highlight=cycle_edges(cycle), positions=layout_positions(edges))
+    return network_html(payload, GRAPH_OPTIONS, height=600, style="border: 1px solid #ddd;")
+
+
+def render_lod_graph(edges, cycle=None, node_budget=300, expanded=()):
+    """Level-of-detail render: acyclic regions are collapsed to stay within ``node_budget``."""
+    view = level_of_detail(edges, node_budget, expanded)
+    payload = graph_payload(view.edges, _lod_group(view), highlight=cycle_edges(cycle),
+                            label_of=view.label, nodes=view.nodes, positions=layout_positions(view.edges))
+    return network_html(payload, GRAPH_OPTIONS, height=600, style="border: 1px solid #ddd;")
@@ -0,0 +1,218 @@
+"""
+asyncio ingestion endpoint for live lock-manager events.
+
+Producers send newline-delimited JSON such as
+    {"type": "wait", "process": "P1", "resource": "R2"}
+over TCP or a Unix socket. "wait" adds the request edge P -> R, "acquire"
+turns it into the assignment edge R -> P and "release" drops both.
+
+Run with:
+    python ingest_server.py --tcp 127.0.0.1:7070
+    python ingest_server.py --unix /tmp/deadlock.sock
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from realtime import RealTimeMonitor, ADD, REMOVE
+
+
+def lock_event_to_edges(event):
+    """Translate one lock event into monitor (op, edge) events."""
+    kind = event["type"]
+    process, resource = event["process"], event["resource"]
+    if kind == "wait":
+        return [(ADD, (process, resource))]
+    if kind == "acquire":
+        return [(REMOVE, (process, resource)), (ADD, (resource, process))]
+    if kind == "release":
+        return [(REMOVE, (resource, process)), (REMOVE, (process, resource))]
+    raise ValueError(f"Unknown lock event type: {kind}")
+
+
+class IngestServer:
+    """
+    Accepts lock events from many producers and applies them to a RealTimeMonitor.
+
+    Each connection parses whole read chunks and queues them as one batch; a
+    single consumer merges queued batches into monitor.apply() calls. The queue
+    is bounded, so when the monitor falls behind, connection handlers stop
+    reading and the kernel socket buffers push back on the producers.
+
+    ``received``, ``applied`` and ``failed`` count lock events, ``applied_ops``
+    the monitor (op, edge) events they expanded to. A batch whose apply() call
+    raises is counted as failed and the consumer moves on.
+    """
+
+    def __init__(self, monitor, max_pending=256, batch_size=10_000, read_size=1 << 16, grace=1.0):
+        """
+        :param grace: Seconds stop() lets open connections finish before
+                      closing them.
+        """
+        self.monitor = monitor
+        self.batch_size = batch_size
+        self.read_size = read_size
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.received = 0
+        self.applied = 0
+        self.applied_ops = 0
+        self.failed = 0
+        self.malformed = 0
+        self.grace = grace
+        self._servers = []
+        self._handlers = {}  # handler task -> its StreamWriter
+        self._consumer = None
+
+    async def start_tcp(self, host="127.0.0.1", port=7070):
+        self._ensure_consumer()
+        server = await asyncio.start_server(self.handle, host, port)
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path):
+        self._ensure_consumer()
+        server = await asyncio.start_unix_server(self.handle, path)
+        self._servers.append(server)
+        return server
+
+    def _ensure_consumer(self):
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+
+    async def handle(self, reader, writer):
+        """Per-connection reader: split chunks into lines, parse, enqueue."""
+        task = asyncio.current_task()
+        self._handlers[task] = writer
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(self.read_size)
+                if not chunk:
+                    break
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                await self._enqueue(lines)
+            if pending.strip():
+                await self._enqueue([pending])
+        finally:
+            writer.close()
+            self._handlers.pop(task, None)
+
+    async def _enqueue(self, lines):
+        events = []
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                events.extend(lock_event_to_edges(json.loads(line)))
+                count += 1
+            except (ValueError, KeyError, TypeError):
+                self.malformed += 1
+        self.received += count
+        if events:
+            await self.queue.put((events, count))  # Blocks this producer when full
+
+    async def _consume(self):
+        while True:
+            batch, count = await self.queue.get()
+            taken = 1
+            # Merge whatever else is already queued into one monitor update
+            while len(batch) < self.batch_size and not self.queue.empty():
+                events, n = self.queue.get_nowait()
+                batch.extend(events)
+                count += n
+                taken += 1
+            try:
+                self.monitor.apply(batch)
+                self.applied += count
+                self.applied_ops += len(batch)
+            except Exception as e:
+                # Keep consuming; a dead consumer would block every producer
+                self.failed += count
+                print(f"⚠️ Failed to apply {count} lock events: {e!r}", file=sys.stderr)
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued batch has been applied."""
+        await self.queue.join()
+
+    async def stop(self):
+        """Stop accepting, let open connections finish, apply what they sent."""
+        for server in self._servers:
+            server.close()
+        if self._handlers:
+            await asyncio.wait(list(self._handlers), timeout=self.grace)
+        # Closing an idle connection hands its handler EOF, so it still
+        # enqueues any partial line before it exits
+        for writer in list(self._handlers.values()):
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+        await self.drain()
+        if self._consumer is not None:
+            self._consumer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._consumer
+            self._consumer = None
+
+    def stats(self):
+        return {"received": self.received, "applied": self.applied, "applied_ops": self.applied_ops,
+                "failed": self.failed, "malformed": self.malformed, "version": self.monitor.version}
+
+
+async def produce(events, host="127.0.0.1", port=7070, path=None, chunk=1000):
+    """Local stand-in producer: send lock events as NDJSON, ``chunk`` lines per write."""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    buffer = []
+    for event in events:
+        buffer.append(json.dumps(event))
+        if len(buffer) >= chunk:
+            writer.write(("\n".join(buffer) + "\n").encode())
+            await writer.drain()  # Honors the server's backpressure
+            buffer = []
+    if buffer:
+        writer.write(("\n".join(buffer) + "\n").encode())
+    await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def serve(tcp=None, unix=None, report_every=5.0):
+    monitor = RealTimeMonitor()
+    server = IngestServer(monitor)
+    if tcp:
+        host, port = tcp.rsplit(":", 1)
+        await server.start_tcp(host, int(port))
+    if unix:
+        await server.start_unix(unix)
+    print(f"✅ Listening on {', '.join(filter(None, [tcp, unix]))}")
+
+    last, last_count = time.monotonic(), 0
+    while True:
+        await asyncio.sleep(report_every)
+        now = time.monotonic()
+        stats = server.stats()
+        rate = (stats["received"] - last_count) / (now - last)
+        last, last_count = now, stats["received"]
+        print(f"{stats['received']} events ({rate:.0f}/s), "
+              f"{len(monitor.snapshot().edges)} edges, {stats['malformed']} malformed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest live lock events into the RAG monitor.")
+    parser.add_argument("--tcp", help="host:port to listen on")
+    parser.add_argument("--unix", help="Unix socket path to listen on")
+    args = parser.parse_args()
+    if not (args.tcp or args.unix):
+        parser.error("give --tcp and/or --unix")
+    asyncio.run(serve(args.tcp, args.unix))
@@ -3,20 +3,28 @@ import networkx as nx
 import pandas as pd
 import numpy as np
 import yaml
-from PIL import Image
-from ocr_processor import OCRProcessor
-from prediction_engine import DeadlockPredictor  # Changed import
-from graph_renderer import render_interactive_graph
+import model_registry
+from graph_cache import cached_predict, cached_render, cache_stats
+from graph_renderer import render_interactive_graph, render_lod_graph
+from graph_lod import level_of_detail
+from src.banker import BankersAlgorithm
+from src.recovery import plan_recovery, apply_recovery
+from risk_simulator import simulate_monitor
 from realtime import RealTimeMonitor
+from detection_scheduler import DetectionScheduler
 from drawing_canvas import CanvasEditor
-from random import choice
 
-# Initialize components
-predictor = DeadlockPredictor()  # Updated predictor
-ocr = OCRProcessor()
-monitor = RealTimeMonitor()
+# Initialize components (models are shared across Streamlit reruns via the registry)
+predictor = model_registry.get("prediction_engine")
+model_registry.register("monitor", RealTimeMonitor)
+model_registry.register("scheduler", lambda: DetectionScheduler(model_registry.get("monitor"), predictor))
+monitor = model_registry.get("monitor")
+scheduler = model_registry.get("scheduler")
 canvas = CanvasEditor()
 
+# Graphs above this many nodes are drawn with collapsed regions
+LOD_NODE_BUDGET = 300
+
 def main():
     st.set_page_config(page_title="NeuroLock: AI-Powered Deadlock Manager", 
                       layout="wide", 
@@ -36,6 +44,18 @@ def main():
                               index=0,
                               label_visibility="collapsed")
 
+        load_times = model_registry.load_times()
+        if load_times:
+            st.divider()
+            st.caption("Model load times: " +
+                       ", ".join(f"{name} {seconds*1000:.0f} ms" for name, seconds in load_times.items()))
+
+        st.divider()
+        st.header("⚡ Result Cache")
+        for name, stats in cache_stats().items():
+            st.caption(f"{name.title()}: {stats['hits']} hits / {stats['misses']} misses "
+                       f"({stats['size']} cached)")
+
     # Main Content Area
     col1, col2 = st.columns([3, 2])
     
@@ -51,7 +71,15 @@ def main():
         if edges:
             st.header("🌐 Live Visualization")
             try:
-                html = render_interactive_graph(edges)
+                node_count = len({node for edge in edges for node in edge})
+                if node_count > LOD_NODE_BUDGET:
+                    # Large graph: collapse acyclic regions, expand on request
+                    regions = sorted(level_of_detail(edges, LOD_NODE_BUDGET).members)
+                    expanded = st.multiselect("Expand regions", regions)
+                    html = cached_render(render_lod_graph, edges, None, LOD_NODE_BUDGET, tuple(expanded))
+                    st.caption(f"{node_count} nodes; {len(regions)} collapsed regions")
+                else:
+                    html = cached_render(render_interactive_graph, edges)
                 st.components.v1.html(html, height=600, scrolling=True)
             except Exception as e:
                 st.error(f"Visualization error: {str(e)}")
@@ -91,8 +119,39 @@ def handle_matrix_input():
         edited = st.data_editor(matrix, 
                                use_container_width=True,
                                height=300)
+        if st.checkbox("Multi-instance resources (Banker's algorithm)"):
+            show_banker_check(edited)
         return [(f"P{i}", f"R{j}") for i in range(size) for j in range(size) if edited.iloc[i,j]]
 
+def show_banker_check(allocation):
+    """Treat the matrix as Allocation and check safety against Max and Available"""
+    st.caption("The matrix above is the Allocation; enter maximum claims and free instances.")
+    maximum = st.data_editor(allocation.copy(), use_container_width=True, key="banker_max")
+    available = st.data_editor(pd.DataFrame([np.zeros(len(allocation.columns))],
+                                            columns=allocation.columns, index=["Available"]),
+                               use_container_width=True, key="banker_available")
+    try:
+        banker = BankersAlgorithm(allocation.to_numpy(), maximum.to_numpy(), available.to_numpy()[0],
+                                  processes=list(allocation.index), resources=list(allocation.columns))
+    except ValueError as e:
+        st.error(str(e))
+        return
+    sequence = banker.safe_sequence()
+    if sequence is None:
+        st.error("🔴 Unsafe state: no completion order exists")
+    else:
+        st.success(f"✅ Safe state. Completion order: {' → '.join(sequence)}")
+
+    col1, col2 = st.columns(2)
+    process = col1.selectbox("Requesting process", list(allocation.index))
+    resource = col2.selectbox("Resource", list(allocation.columns))
+    count = st.number_input("Instances", min_value=1, value=1)
+    try:
+        granted = banker.can_grant(process, {resource: count})
+        st.info(f"Request {process} → {count}×{resource}: {'can be granted safely' if granted else 'must wait'}")
+    except ValueError as e:
+        st.warning(str(e))
+
 def handle_canvas_input():
     with st.expander("🎨 Draw System Architecture", expanded=True):
         return canvas.get_edges()
@@ -103,7 +162,7 @@ def handle_ocr_input():
                                    type=["png", "jpg"])
         if uploaded:
             with st.spinner("Analyzing diagram..."):
-                return ocr.process_image(uploaded)
+                return model_registry.get("ocr").process_image(uploaded)
     return []
 
 def handle_realtime_input():
@@ -112,20 +171,30 @@ def handle_realtime_input():
         with col1:
             if st.button("Start Live Monitoring", type="primary"):
                 monitor.start()
+                scheduler.start()
         with col2:
             if st.button("Stop Monitoring"):
                 monitor.stop()
+                scheduler.stop()
         
         metrics = monitor.get_metrics()
         st.metric("Active Processes", metrics["processes"])
         st.metric("Resource Allocations", metrics["allocations"])
         st.metric("Waiting Requests", metrics["waiting"])
         
+        if scheduler.running:
+            result = scheduler.last_result
+            st.metric("Detection Interval", f"{scheduler.interval:.2f}s")
+            if result["deadlock"]:
+                st.error(f"🔴 Background detection: deadlock in {len(result['cycles'])} group(s)")
+            else:
+                st.success(f"🟢 Background detection: no deadlock (risk {result['risk']*100:.0f}%)")
+        
         return monitor.get_state()
 
 def show_ai_analysis(edges, model_type):
     """Professional analysis display with prediction engine integration"""
-    prediction = predictor.predict(edges, model_type)
+    prediction = cached_predict(predictor, edges, model_type)
     
     tab1, tab2, tab3 = st.tabs(["🧠 AI Diagnosis", "📈 Risk Analysis", "⚡ Live Prediction"])
 
@@ -138,9 +207,11 @@ def show_ai_analysis(edges, model_type):
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("Apply Quick Fix", type="primary"):
-                    if cycle:
-                        edges.remove(choice(cycle))
-                        st.success("✅ Fix Applied! Refreshing...")
+                    # Preempt the cheapest set of edges that breaks every cycle
+                    plan = plan_recovery(edges, mode="edge")
+                    if plan["victims"]:
+                        edges[:] = apply_recovery(edges, plan["victims"], mode="edge")
+                        st.success(f"✅ Fix Applied! Preempted {', '.join(f'{u}→{v}' for u, v in plan['victims'])}. Refreshing...")
                         st.experimental_rerun()
             with col2:
                 st.download_button(
@@ -174,11 +245,15 @@ def show_ai_analysis(edges, model_type):
         monitor_data = monitor.get_metrics()
         st.line_chart(monitor_data, 
              use_container_width=True)
+        # What-if forecast: the live monitor's graph when it has one, else the analyzed graph
+        forecast = simulate_monitor(monitor, seed=0) if monitor_data["allocations"] else prediction['forecast']
+        st.write("**P(deadlock within k lock operations)**")
+        st.line_chart(pd.DataFrame({"probability": forecast['curve']}), use_container_width=True)
         st.write("**System Insights**")
         st.json({
-            "Critical Nodes": prediction.get('critical_nodes', []),
-            "Resource Utilization": f"{np.random.randint(30,90)}%",
-            "Pending Requests": prediction['analysis'].get('pending_requests', 0)
+            "Critical Nodes": prediction['analysis'].get('cycle_nodes', []),
+            "Resource Utilization": f"{forecast['utilization']*100:.0f}%",
+            "Pending Requests": monitor_data["waiting"]
         })
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+import threading
+import time
+
+# name -> zero-argument factory; heavy imports belong inside the factory
+_factories = {}
+_instances = {}
+_load_times = {}
+_lock = threading.RLock()  # Reentrant: factories may get() the models they depend on
+
+
+def register(name, factory):
+    """Register a factory that builds the named model on first use."""
+    with _lock:
+        _factories[name] = factory
+
+
+def get(name):
+    """Return the process-wide instance of a model, building it on first use."""
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+    with _lock:
+        if name not in _instances:
+            if name not in _factories:
+                raise KeyError(f"Unknown model: {name}")
+            start = time.perf_counter()
+            _instances[name] = _factories[name]()
+            _load_times[name] = time.perf_counter() - start
+        return _instances[name]
+
+
+def is_loaded(name):
+    return name in _instances
+
+
+def load_times():
+    """Seconds spent building each loaded model."""
+    return dict(_load_times)
+
+
+def reset(name=None):
+    """Drop one (or every) cached instance so it is rebuilt on next use."""
+    with _lock:
+        for key in ([name] if name else list(_instances)):
+            _instances.pop(key, None)
+            _load_times.pop(key, None)
+
+
+def _load_random_forest():
+    import joblib
+    return joblib.load("deadlock_model.pkl")
+
+
+def _load_lstm_predictor():
+    from ai_model import DeadlockPredictor
+    return DeadlockPredictor()
+
+
+def _load_prediction_engine():
+    from prediction_engine import DeadlockPredictor
+    return DeadlockPredictor()
+
+
+def _load_ocr():
+    from ocr_processor import OCRProcessor
+    return OCRProcessor()
+
+
+register("random_forest", _load_random_forest)
+register("lstm", _load_lstm_predictor)
+register("prediction_engine", _load_prediction_engine)
+register("ocr", _load_ocr)
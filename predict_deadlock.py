@@ -1,18 +1,16 @@
-import joblib
-import pandas as pd
-import ast
+import model_registry
+from graph_layout import layout_positions
+from dataset_loader import parse_edge_list
+from graph_features import edge_list_features
 import networkx as nx
 import matplotlib.pyplot as plt
 
-# Load the trained model
-model = joblib.load("deadlock_model.pkl")
-
 # Function to visualize the RAG
 def visualize_rag(graph_edges, deadlock_detected):
     G = nx.DiGraph()
     G.add_edges_from(graph_edges)
 
-    pos = nx.spring_layout(G)
+    pos = layout_positions(graph_edges)  # Cached per graph, computed with NumPy
     nx.draw(G, pos, with_labels=True, node_size=700, node_color="lightblue", font_size=10)
 
     if deadlock_detected:
@@ -25,8 +23,9 @@ def visualize_rag(graph_edges, deadlock_detected):
 # Function to predict and visualize deadlocks
 def predict_and_visualize(graph_edges):
     # Convert the input graph to the same feature format
-    edge_count = len(graph_edges)
-    input_data = pd.DataFrame({"edge_count": [edge_count]})  # Ensure feature name matches training data
+    model = model_registry.get("random_forest")  # Loaded once, on first prediction
+    features = edge_list_features(graph_edges)
+    input_data = features[list(model.feature_names_in_)]  # Ensure feature names match training data
 
     # Predict deadlock
     prediction = model.predict(input_data)[0]
@@ -49,7 +48,7 @@ def run_tests():
 
     for name, test_graph in test_cases.items():
         print(f"\n🔹 Running test: {name}")
-        graph_edges = ast.literal_eval(test_graph)
+        graph_edges = parse_edge_list(test_graph)
         predict_and_visualize(graph_edges)
 
 # Main function for user input
@@ -60,9 +59,9 @@ def main():
     if choice == "yes":
         user_graph = input("Enter the graph as a list of edges (e.g., [('P1', 'R1'), ('R1', 'P2')]): ")
         try:
-            graph_edges = ast.literal_eval(user_graph)
+            graph_edges = parse_edge_list(user_graph)
             predict_and_visualize(graph_edges)
-        except (SyntaxError, ValueError):
+        except ValueError:
             print("❌ Invalid input format. Please enter a valid list of tuples.")
     else:
         print("\n🔹 Running predefined test cases...")
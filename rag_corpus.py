@@ -0,0 +1,162 @@
+"""
+Binary columnar storage for resource allocation graph corpora.
+
+A corpus is a directory holding:
+    meta.json    format version and graph/edge counts
+    names.json   node-name dictionary (node id -> label)
+    offsets.bin  int64[num_graphs + 1], edges of graph i are offsets[i]:offsets[i+1]
+    src.bin      int32[num_edges]
+    dst.bin      int32[num_edges]
+    labels.bin   int8[num_graphs], 1 = deadlock
+
+Convert the CSV dataset with:
+    python rag_corpus.py deadlock_dataset.csv deadlock_dataset.rag
+"""
+import json
+import os
+import sys
+import numpy as np
+from dataset_loader import EdgeTable, iter_edge_tables
+
+FORMAT_VERSION = 1
+
+
+class CorpusWriter:
+    """Append graphs to a corpus directory without holding the corpus in memory."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.names = []
+        self._vocab = {}
+        self.num_graphs = 0
+        self.num_edges = 0
+        self._offsets = open(os.path.join(directory, "offsets.bin"), "wb")
+        self._src = open(os.path.join(directory, "src.bin"), "wb")
+        self._dst = open(os.path.join(directory, "dst.bin"), "wb")
+        self._labels = open(os.path.join(directory, "labels.bin"), "wb")
+        self._offsets.write(np.zeros(1, dtype=np.int64).tobytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, counts, src, dst, labels, names):
+        """
+        Append a batch of graphs.
+
+        :param counts: Number of edges of every graph in the batch.
+        :param src: Edge sources as ids into ``names``, grouped by graph.
+        :param dst: Edge targets as ids into ``names``, grouped by graph.
+        :param labels: Deadlock label of every graph in the batch.
+        :param names: Node labels the batch ids refer to.
+        """
+        mapping = np.empty(len(names), dtype=np.int32)
+        for i, name in enumerate(names):
+            if name not in self._vocab:
+                self._vocab[name] = len(self.names)
+                self.names.append(name)
+            mapping[i] = self._vocab[name]
+
+        counts = np.asarray(counts, dtype=np.int64)
+        offsets = self.num_edges + np.cumsum(counts)
+        self._offsets.write(offsets.astype(np.int64).tobytes())
+        self._src.write(mapping[np.asarray(src, dtype=np.int64)].tobytes())
+        self._dst.write(mapping[np.asarray(dst, dtype=np.int64)].tobytes())
+        self._labels.write(np.asarray(labels, dtype=np.int8).tobytes())
+        self.num_graphs += len(counts)
+        self.num_edges += int(counts.sum())
+
+    def append_table(self, table):
+        """Append every graph of an EdgeTable."""
+        self.append(table.edge_counts(), table.src, table.dst, table.labels, table.names)
+
+    def close(self):
+        if self._offsets.closed:
+            return
+        for f in (self._offsets, self._src, self._dst, self._labels):
+            f.close()
+        with open(os.path.join(self.directory, "names.json"), "w") as f:
+            json.dump(self.names, f)
+        with open(os.path.join(self.directory, "meta.json"), "w") as f:
+            json.dump({"version": FORMAT_VERSION,
+                       "num_graphs": self.num_graphs,
+                       "num_edges": self.num_edges}, f)
+
+
+class RAGCorpus:
+    """
+    Read-only, memory-mapped view of a corpus directory.
+
+    Opening a corpus only maps the column files, so random access to graph i
+    touches just the pages holding its edges.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus version: {meta.get('version')}")
+        with open(os.path.join(directory, "names.json")) as f:
+            self.names = json.load(f)
+        self.num_graphs = meta["num_graphs"]
+        self.num_edges = meta["num_edges"]
+        self.offsets = self._map("offsets.bin", np.int64, self.num_graphs + 1)
+        self.src = self._map("src.bin", np.int32, self.num_edges)
+        self.dst = self._map("dst.bin", np.int32, self.num_edges)
+        self.labels = self._map("labels.bin", np.int8, self.num_graphs)
+
+    def _map(self, name, dtype, length):
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(os.path.join(self.directory, name), dtype=dtype, mode="r", shape=(length,))
+
+    def __len__(self):
+        return self.num_graphs
+
+    def graph_arrays(self, i):
+        """Return the (src, dst) id arrays of graph ``i``."""
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return self.src[lo:hi], self.dst[lo:hi]
+
+    def graph_edges(self, i):
+        """Return graph ``i`` as a list of (source, target) label tuples."""
+        src, dst = self.graph_arrays(i)
+        names = self.names
+        return [(names[u], names[v]) for u, v in zip(src.tolist(), dst.tolist())]
+
+    def edge_counts(self):
+        return np.diff(self.offsets)
+
+    def edge_table(self, start=0, stop=None):
+        """Load graphs ``start:stop`` as an EdgeTable."""
+        stop = self.num_graphs if stop is None else min(stop, self.num_graphs)
+        lo, hi = self.offsets[start], self.offsets[stop]
+        counts = np.diff(self.offsets[start:stop + 1])
+        graph_id = np.repeat(np.arange(start, stop, dtype=np.int32), counts)
+        return EdgeTable(graph_id, np.array(self.src[lo:hi]), np.array(self.dst[lo:hi]),
+                         self.names, np.array(self.labels[start:stop]), start)
+
+    def iter_edge_tables(self, batch_size=100_000):
+        """Stream the corpus as EdgeTables of ``batch_size`` graphs."""
+        for start in range(0, self.num_graphs, batch_size):
+            yield self.edge_table(start, start + batch_size)
+
+
+def convert_csv(csv_path, directory, batch_size=100_000):
+    """Convert a dataset CSV (like deadlock_dataset.csv) into a corpus directory."""
+    with CorpusWriter(directory) as writer:
+        for table in iter_edge_tables(csv_path, batch_size=batch_size):
+            writer.append_table(table)
+    return RAGCorpus(directory)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python rag_corpus.py <dataset.csv> <corpus_dir>")
+        sys.exit(1)
+    corpus = convert_csv(sys.argv[1], sys.argv[2])
+    print(f"✅ Converted {len(corpus)} graphs ({corpus.num_edges} edges) to {sys.argv[2]}")
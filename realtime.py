@@ -1,50 +1,163 @@
 import threading
 import time
 import random
-import numpy as np
+
+ADD = "add"
+REMOVE = "remove"
+
+class Snapshot:
+    """Immutable view of the graph at one version"""
+    __slots__ = ("version", "edges")
+    
+    def __init__(self, version, edges):
+        self.version = version
+        self.edges = edges  # frozenset of (source, target)
 
 class RealTimeMonitor:
-    def __init__(self):
+    """
+    Live resource allocation graph built from an append-only log of edge events.
+    
+    Writers update one mutable edge set and append ("add" | "remove", edge)
+    events under the lock, so a batch costs O(batch) whatever the graph size.
+    Readers never take the writer lock: snapshot() rolls the last published
+    Snapshot forward with the logged events, and the writer only builds one
+    itself when it trims log entries that the published Snapshot still needs.
+    """
+    def __init__(self, log_capacity=100_000):
         self.running = False
-        self.edges = []
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # Serializes writers only
+        self._publish = threading.Lock()  # Guards replacing the cached Snapshot
+        self.listeners = []
+        self.log_capacity = log_capacity
+        self._edges = set()
+        self._version = 0
+        # (entries, version before the first entry); entries are (version, op,
+        # edge), appended in place and replaced as a whole when trimmed
+        self._log = ([], 0)
+        self._snapshot = Snapshot(0, frozenset())
         self.processes = ["P1", "P2", "P3"]
         self.resources = ["R1", "R2", "R3"]
         
     def start(self):
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self.simulate)
+            self.thread = threading.Thread(target=self.simulate, daemon=True)
             self.thread.start()
             
     def stop(self):
         self.running = False
         
+    def subscribe(self, callback):
+        """Call ``callback(version, events)`` after every batch with the (op, edge) events it applied"""
+        self.listeners.append(callback)
+        
+    def add_edge(self, u, v):
+        return self.apply([(ADD, (u, v))])
+        
+    def remove_edge(self, u, v):
+        return self.apply([(REMOVE, (u, v))])
+        
+    def apply(self, events):
+        """Apply a batch of (op, edge) events atomically and return the new version"""
+        with self.lock:
+            edges, (log, base) = self._edges, self._log
+            version = start = self._version
+            applied = []
+            for op, edge in events:
+                edge = tuple(edge)
+                if op == ADD and edge not in edges:
+                    edges.add(edge)
+                elif op == REMOVE and edge in edges:
+                    edges.discard(edge)
+                else:
+                    continue  # No-op events are not logged
+                version += 1
+                log.append((version, op, edge))
+                applied.append((op, edge))
+            if version == start:
+                return version
+            self._version = version  # Published after its log entries
+            if len(log) > 2 * self.log_capacity:
+                # Trim in bulk so the copy is amortized over many batches. Readers
+                # roll the cached Snapshot forward from the log, so it must not
+                # be older than the first kept entry.
+                drop = len(log) - self.log_capacity
+                if self._snapshot.version < base + drop:
+                    self._publish_snapshot(Snapshot(version, frozenset(edges)))
+                self._log = (log[drop:], base + drop)
+        
+        for callback in self.listeners:
+            callback(version, applied)
+        return version
+        
+    def replace(self, edges):
+        """Move to a new edge set, logging only the differences"""
+        current = self.snapshot().edges
+        target = set(map(tuple, edges))
+        return self.apply([(REMOVE, e) for e in current - target] +
+                          [(ADD, e) for e in target - current])
+        
+    def snapshot(self):
+        """Current immutable Snapshot (never takes the writer lock)"""
+        version = self._version
+        log, base = self._log
+        snapshot = self._snapshot  # Read after the log, so it is not older than base
+        if snapshot.version >= version:
+            return snapshot
+        edges = set(snapshot.edges)
+        for _, op, edge in log[snapshot.version - base:version - base]:
+            if op == ADD:
+                edges.add(edge)
+            else:
+                edges.discard(edge)
+        return self._publish_snapshot(Snapshot(version, frozenset(edges)))
+        
+    def _publish_snapshot(self, snapshot):
+        """Cache ``snapshot`` unless a newer one is already cached; returns it."""
+        with self._publish:
+            if snapshot.version > self._snapshot.version:
+                self._snapshot = snapshot
+        return snapshot
+        
+    @property
+    def version(self):
+        return self._version
+        
+    def deltas_since(self, version):
+        """
+        Events after ``version`` as (current_version, [(op, edge), ...]).
+        
+        Returns (current_version, None) if the log no longer reaches back to
+        ``version``; the caller should then resync from snapshot().
+        """
+        current = self._version
+        log, base = self._log
+        if version < base:
+            return current, None
+        return current, [(op, edge) for _, op, edge in log[version - base:current - base]]
+        
     def simulate(self):
         """Generate realistic allocation patterns"""
         while self.running:
-            with self.lock:
-                # Clear old allocations
-                self.edges.clear()
-                
-                # Create plausible allocations
-                for p in self.processes:
-                    if random.random() > 0.4:
-                        resource = random.choice(self.resources)
-                        self.edges.append((p, resource))
-                        if random.random() > 0.6:  # Simulate resource holding
-                            self.edges.append((resource, random.choice(self.processes)))
-                
-                time.sleep(2)  # Update every 2 seconds
+            # Create plausible allocations
+            edges = []
+            for p in self.processes:
+                if random.random() > 0.4:
+                    resource = random.choice(self.resources)
+                    edges.append((p, resource))
+                    if random.random() > 0.6:  # Simulate resource holding
+                        edges.append((resource, random.choice(self.processes)))
+            self.replace(edges)
+            time.sleep(2)  # Update every 2 seconds
     
     def get_state(self):
-        with self.lock:
-            return self.edges.copy()
+        return list(self.snapshot().edges)
     
     def get_metrics(self):
+        edges = self.snapshot().edges
         return {
             "processes": len(self.processes),
             "resources": len(self.resources),
-            "allocations": len(self.edges),
-            "waiting": np.random.randint(0, 5)
+            "allocations": len(edges),
+            "waiting": sum(1 for u, v in edges if u in self.processes and v in self.resources)
         }
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Monte Carlo what-if simulation of a resource allocation graph.
+
+The current RAG is encoded as single-instance state arrays: ``holder[r]`` is
+the process holding resource r (-1 if free) and ``wait[p]`` the resource
+process p is blocked on (-1 if runnable). Every rollout then repeats one
+random action per step: a runnable process either releases a resource it
+holds (handing it to a waiting process) or requests a random resource,
+blocking if someone else holds it.
+
+All rollouts of all graphs advance together as rows of the same arrays. With
+one wait per process the wait-for graph is functional, so deadlock checks are
+a few rounds of pointer doubling over the rows that just blocked. Deadlock is
+absorbing, so the step at which each row first deadlocks gives the whole
+curve P(deadlock within t steps) for t = 0..steps.
+
+Random numbers are counter-based: every draw hashes (row key, step, draw,
+column), and row keys come from a per-graph seed and the rollout index. A
+graph's curve therefore depends only on its own seed, not on which graphs
+share its batch, how rows are padded or how they are sharded.
+"""
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from src.rag import node_kind, PROCESS, RESOURCE
+
+# Rows (graph x rollout) handled by one worker task
+SHARD_ROWS = 1 << 15
+# Draws per step in rollout(), each hashed with its own slot number
+_ACTOR, _RELEASE, _RELEASED, _WOKEN, _REQUEST = range(5)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(x):
+    """splitmix64 finalizer over a uint64 array."""
+    with np.errstate(over="ignore"):
+        x = x + _GOLDEN
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def uniform(keys, step, slot, columns=None):
+    """
+    Counter-based uniforms in [0, 1) for each row key.
+
+    :param keys: uint64 row keys.
+    :param columns: If given, return a len(keys) x columns array where column
+                    j is the same draw whatever the number of columns.
+    """
+    with np.errstate(over="ignore"):
+        x = _mix(keys ^ np.uint64((step * 8 + slot) * 0xD1B54A32D192ED03 % (1 << 64)))
+        if columns is not None:
+            x = _mix(x[:, None] ^ (np.arange(columns, dtype=np.uint64) * _GOLDEN))
+    return (x >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def row_keys(graph_seeds, simulations):
+    """uint64 key of every (graph, rollout) row, graph-major."""
+    seeds = np.asarray(graph_seeds, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        rollouts = np.arange(simulations, dtype=np.uint64) * _GOLDEN
+        return _mix(_mix(seeds)[:, None] ^ rollouts[None, :]).ravel()
+
+
+def graph_seeds(seed, count):
+    """One 64-bit seed per graph position, derived from ``seed``."""
+    entropy = np.random.SeedSequence(seed).entropy
+    return [int(np.random.SeedSequence(entropy, spawn_key=(i,)).generate_state(1, np.uint64)[0])
+            for i in range(count)]
+
+
+def encode_state(edges):
+    """
+    Single-instance state arrays for one RAG.
+
+    A resource keeps its first assignment edge, a process its first blocking
+    request; requests for free resources are granted.
+
+    :return: Tuple (holder, wait, processes, resources).
+    """
+    processes = {}
+    resources = {}
+    holds = []
+    requests = []
+    for u, v in edges:
+        if node_kind(u) == RESOURCE or node_kind(v) == PROCESS:
+            r, p, target = u, v, holds
+        else:
+            p, r, target = u, v, requests
+        target.append((processes.setdefault(p, len(processes)), resources.setdefault(r, len(resources))))
+    holder = np.full(len(resources), -1, dtype=np.int32)
+    wait = np.full(len(processes), -1, dtype=np.int32)
+    for p, r in holds:
+        if holder[r] < 0:
+            holder[r] = p
+    for p, r in requests:
+        if holder[r] < 0:
+            holder[r] = p
+        elif holder[r] != p and wait[p] < 0:
+            wait[p] = r
+    return holder, wait, list(processes), list(resources)
+
+
+def deadlocked(holder, wait):
+    """Rows of (holder, wait) state arrays whose wait-for graph has a cycle."""
+    rows, n = wait.shape
+    if n == 0:
+        return np.zeros(rows, dtype=bool)
+    target = np.take_along_axis(holder, np.maximum(wait, 0), axis=1) if holder.shape[1] else np.full_like(wait, -1)
+    # Chains that end are absorbed by the sentinel node n; after 2^k >= n + 1
+    # jumps only nodes that reach a cycle are somewhere else
+    jump = np.full((rows, n + 1), n, dtype=np.int64)
+    jump[:, :n] = np.where((wait >= 0) & (target >= 0), target, n)
+    for _ in range(int(np.ceil(np.log2(n + 1)))):
+        jump = np.take_along_axis(jump, jump, axis=1)
+    return (jump[:, :n] != n).any(axis=1)
+
+
+def rollout(holder, wait, n_valid, m_valid, steps, keys, release_prob=0.3):
+    """
+    Advance independent systems ``steps`` random actions, in place.
+
+    :param holder: rows x m int array (padded columns stay -1).
+    :param wait: rows x n int array (padded columns stay -1).
+    :param n_valid: Number of real processes per row.
+    :param m_valid: Number of real resources per row.
+    :param keys: uint64 key per row (see row_keys); fixes the row's draws.
+    :return: First deadlocked step per row: 0 if already deadlocked,
+             steps + 1 if it never deadlocks.
+    """
+    rows, n = wait.shape
+    m = holder.shape[1]
+    index = np.arange(rows)
+    real = np.arange(n) < n_valid[:, None]
+    hit = np.full(rows, steps + 1, dtype=np.int64)
+    hit[deadlocked(holder, wait)] = 0
+    if n == 0:
+        return hit
+    for step in range(1, steps + 1):
+        runnable = real & (wait < 0) & (hit > steps)[:, None]
+        active = runnable.any(axis=1)
+        actor = np.where(runnable, uniform(keys, step, _ACTOR, n), -1.0).argmax(axis=1)
+        held = (holder == actor[:, None]) & active[:, None]
+        release = held.any(axis=1) & (uniform(keys, step, _RELEASE) < release_prob)
+
+        rel = index[release]
+        if len(rel):
+            r = np.where(held[rel], uniform(keys[rel], step, _RELEASED, m), -1.0).argmax(axis=1)
+            waiters = wait[rel] == r[:, None]
+            woken = np.where(waiters, uniform(keys[rel], step, _WOKEN, n), -1.0).argmax(axis=1)
+            granted = waiters.any(axis=1)
+            holder[rel, r] = np.where(granted, woken, -1)
+            wait[rel[granted], woken[granted]] = -1
+
+        req = index[active & ~release & (m_valid > 0)]
+        if len(req):
+            r = (uniform(keys[req], step, _REQUEST) * m_valid[req]).astype(np.int64)
+            who = actor[req]
+            current = holder[req, r]
+            free = current < 0
+            holder[req[free], r[free]] = who[free]
+            blocked = ~free & (current != who)
+            wait[req[blocked], who[blocked]] = r[blocked]
+            # Only a new wait can close a cycle
+            check = req[blocked]
+            if len(check):
+                hit[check[deadlocked(holder[check], wait[check])]] = step
+    return hit
+
+
+def _pad(states):
+    n = max([len(state[1]) for state in states] + [0])
+    m = max([len(state[0]) for state in states] + [0])
+    holder = np.full((len(states), m), -1, dtype=np.int32)
+    wait = np.full((len(states), n), -1, dtype=np.int32)
+    n_valid = np.zeros(len(states), dtype=np.int64)
+    m_valid = np.zeros(len(states), dtype=np.int64)
+    for i, (h, w, _, _) in enumerate(states):
+        holder[i, :len(h)] = h
+        wait[i, :len(w)] = w
+        n_valid[i] = len(w)
+        m_valid[i] = len(h)
+    return holder, wait, n_valid, m_valid
+
+
+def _run_shard(holder, wait, n_valid, m_valid, steps, release_prob, keys):
+    """Worker: roll one shard of rows forward."""
+    return rollout(holder, wait, n_valid, m_valid, steps, keys, release_prob)
+
+
+def simulate_batch(graphs, steps=20, simulations=256, release_prob=0.3, workers=1, seed=None, seeds=None):
+    """
+    Estimate P(deadlock within t steps) for many graphs at once.
+
+    :param graphs: List of edge lists.
+    :param simulations: Rollouts per graph.
+    :param workers: Worker processes; the result never depends on them.
+    :param seed: Seed for graphs by position, used when ``seeds`` is None.
+    :param seeds: Optional 64-bit seed per graph; a graph's curve then depends
+                  only on its own seed, whatever else is in the batch.
+    :return: Dict with "curve" (graphs x steps + 1 array of cumulative deadlock
+             probabilities), "probability" (curve at ``steps``) and
+             "utilization" (fraction of resources held now, per graph).
+    """
+    states = [encode_state(edges) for edges in graphs]
+    holder, wait, n_valid, m_valid = _pad(states)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        utilization = np.where(m_valid > 0, (holder >= 0).sum(axis=1) / np.maximum(m_valid, 1), 0.0)
+    total = len(graphs) * simulations
+    keys = row_keys(graph_seeds(seed, len(graphs)) if seeds is None else seeds, simulations)
+    shards = []
+    for start in range(0, total, SHARD_ROWS):
+        graph_of = np.arange(start, min(start + SHARD_ROWS, total)) // simulations
+        shards.append((holder[graph_of], wait[graph_of], n_valid[graph_of], m_valid[graph_of],
+                       steps, release_prob, keys[start:start + SHARD_ROWS]))
+
+    if workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hits = list(pool.map(_run_shard, *zip(*shards)))
+    else:
+        hits = [_run_shard(*args) for args in shards]
+    hits = np.concatenate(hits) if hits else np.zeros(0, dtype=np.int64)
+
+    counts = np.zeros((len(graphs), steps + 2), dtype=np.int64)
+    np.add.at(counts, (np.arange(total) // max(simulations, 1), hits), 1)
+    curve = np.cumsum(counts[:, :steps + 1], axis=1) / max(simulations, 1)
+    return {"curve": curve, "probability": curve[:, -1], "utilization": utilization,
+            "steps": steps, "simulations": simulations}
+
+
+def simulate_risk(edges, steps=20, simulations=1000, release_prob=0.3, workers=1, seed=None):
+    """simulate_batch for a single graph; returns scalars and a 1-D curve."""
+    result = simulate_batch([edges], steps, simulations, release_prob, workers, seed)
+    return {"curve": result["curve"][0], "probability": float(result["probability"][0]),
+            "utilization": float(result["utilization"][0]), "steps": steps, "simulations": simulations}
+
+
+def simulate_monitor(monitor, **kwargs):
+    """What-if forecast from the current RealTimeMonitor snapshot."""
+    return simulate_risk(list(monitor.snapshot().edges), **kwargs)
@@ -1,7 +1,9 @@
 import matplotlib.pyplot as plt
 import networkx as nx
+from graph_layout import layout_positions
 
 def visualize_deadlock(graph):
-    pos = nx.spring_layout(graph)  # Or any other layout for visualization
+    layout = layout_positions(graph.edges())  # Cached per graph fingerprint
+    pos = {node: layout.get(node, (0.0, 0.0)) for node in graph}
     nx.draw(graph, pos, with_labels=True, node_size=500, node_color="lightblue", font_size=10)
     plt.show(block=False)  # Show plot without blocking execution
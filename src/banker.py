@@ -0,0 +1,146 @@
+import numpy as np
+
+
+def safety_order(available, demand, allocation):
+    """
+    Run the safety (or Coffman detection) algorithm over count matrices.
+
+    Every round finishes all processes whose outstanding demand fits in the
+    current work vector at once and returns their allocations to it. A process
+    that can finish keeps being able to as work only grows, so batching rounds
+    gives the same finishable set as the one-at-a-time textbook loop.
+
+    :param available: Length-m vector of free instances per resource.
+    :param demand: n x m matrix of instances each process may still ask for
+                   (Need for avoidance, Request for detection).
+    :param allocation: n x m matrix of instances each process holds.
+    :return: Tuple (finished, order): a boolean vector of processes that can
+             complete and the indices of those processes in a valid order.
+    """
+    work = np.array(available, dtype=np.int64)
+    demand = np.asarray(demand)
+    allocation = np.asarray(allocation)
+    pending = np.arange(len(demand))
+    order = []
+    while len(pending):
+        ready = (demand[pending] <= work).all(axis=1)
+        if not ready.any():
+            break
+        done = pending[ready]
+        order.append(done)
+        work += allocation[done].sum(axis=0)
+        pending = pending[~ready]
+    finished = np.ones(len(demand), dtype=bool)
+    finished[pending] = False
+    order = np.concatenate(order) if order else np.zeros(0, dtype=np.intp)
+    return finished, order
+
+
+class BankersAlgorithm:
+    """
+    Deadlock avoidance for multi-instance resources.
+
+    Holds the Allocation and Max matrices and the Available vector and keeps
+    them up to date as requests are granted and resources released. Grants
+    are only made when the resulting state is still safe; releases can never
+    make a safe state unsafe, so the last safety result is reused across them.
+    """
+
+    def __init__(self, allocation, maximum, available, processes=None, resources=None):
+        """
+        :param allocation: n x m matrix of held instances.
+        :param maximum: n x m matrix of maximum claims.
+        :param available: Length-m vector of free instances.
+        :param processes: Optional process labels (defaults to P0..Pn-1).
+        :param resources: Optional resource labels (defaults to R0..Rm-1).
+        """
+        self.allocation = np.array(allocation, dtype=np.int64, ndmin=2)
+        self.maximum = np.array(maximum, dtype=np.int64, ndmin=2)
+        self.available = np.array(available, dtype=np.int64)
+        n, m = self.allocation.shape
+        if self.maximum.shape != (n, m) or self.available.shape != (m,):
+            raise ValueError("Allocation and Max must be n x m and Available length m")
+        if (self.allocation < 0).any() or (self.available < 0).any():
+            raise ValueError("Counts must be non-negative")
+        if (self.allocation > self.maximum).any():
+            raise ValueError("Allocation exceeds the maximum claim")
+        self.need = self.maximum - self.allocation
+        self.processes = list(processes) if processes is not None else [f"P{i}" for i in range(n)]
+        self.resources = list(resources) if resources is not None else [f"R{j}" for j in range(m)]
+        self._index = {name: i for i, name in enumerate(self.processes)}
+        self._safe = None
+
+    @classmethod
+    def from_totals(cls, allocation, maximum, total, **kwargs):
+        """Build from total instances per resource instead of Available."""
+        allocation = np.array(allocation, dtype=np.int64, ndmin=2)
+        return cls(allocation, maximum, np.asarray(total) - allocation.sum(axis=0), **kwargs)
+
+    def _row(self, process):
+        return self._index[process] if process in self._index else int(process)
+
+    def _vector(self, amounts):
+        if isinstance(amounts, dict):
+            vector = np.zeros(len(self.resources), dtype=np.int64)
+            for resource, count in amounts.items():
+                vector[self.resources.index(resource)] = count
+            return vector
+        return np.asarray(amounts, dtype=np.int64)
+
+    def is_safe(self):
+        if self._safe is None:
+            self._safe = bool(safety_order(self.available, self.need, self.allocation)[0].all())
+        return self._safe
+
+    def safe_sequence(self):
+        """Process labels in a safe completion order, or None if the state is unsafe."""
+        finished, order = safety_order(self.available, self.need, self.allocation)
+        self._safe = bool(finished.all())
+        return [self.processes[i] for i in order.tolist()] if self._safe else None
+
+    def can_grant(self, process, request):
+        """
+        Check whether granting ``request`` to ``process`` leaves the system safe.
+
+        :param request: Length-m vector or dict of resource label -> count.
+        :raises ValueError: If the request exceeds the process's remaining claim.
+        """
+        i = self._row(process)
+        request = self._vector(request)
+        if (request > self.need[i]).any():
+            raise ValueError(f"{self.processes[i]} requested more than its maximum claim")
+        if (request > self.available).any():
+            return False
+        if self.is_safe() and (self.need[i] <= self.available).all():
+            # The requester can run to completion straight away and then returns
+            # at least what was free before, so the old safe order still works
+            return True
+        self._apply(i, request)
+        try:
+            return bool(safety_order(self.available, self.need, self.allocation)[0].all())
+        finally:
+            self._apply(i, -request)
+
+    def request(self, process, request):
+        """Grant ``request`` if it is safe; returns whether it was granted."""
+        if not self.can_grant(process, request):
+            return False
+        self._apply(self._row(process), self._vector(request))
+        self._safe = True
+        return True
+
+    def release(self, process, amounts=None):
+        """Return instances (all held ones by default) to Available."""
+        i = self._row(process)
+        amounts = self.allocation[i].copy() if amounts is None else self._vector(amounts)
+        if (amounts > self.allocation[i]).any():
+            raise ValueError(f"{self.processes[i]} cannot release more than it holds")
+        self._apply(i, -amounts)
+        if not self._safe:
+            # A release can turn an unsafe state safe, never the reverse
+            self._safe = None
+
+    def _apply(self, i, amounts):
+        self.allocation[i] += amounts
+        self.need[i] -= amounts
+        self.available -= amounts
@@ -1,14 +1,46 @@
+import time
 import networkx as nx
+from src.multi_instance import multi_instance_deadlock
+from src.recovery import plan_recovery
 
-def detect_deadlock(edges):
+def detect_deadlock(edges, max_cycles=None, max_length=None, timeout=None, witness_only=False,
+                    capacity=None, counts=None):
     """
     Detects all deadlock cycles in the given resource allocation graph.
     
     :param edges: List of tuples representing process-resource relationships.
+    :param max_cycles: Stop after this many cycles (None for no limit).
+    :param max_length: Ignore cycles with more nodes than this (None for no limit).
+    :param timeout: Stop enumerating after this many seconds (None for no limit).
+    :param witness_only: Return a single cycle per strongly connected component
+                         instead of enumerating every elementary cycle.
+    :param capacity: Dict of resource -> instance count for multi-instance
+                     resources. When given, deadlock is decided by graph
+                     reduction, only cycles through deadlocked processes are
+                     reported and a third element is returned.
+    :param counts: Optional dict of edge -> instances requested or held.
     :return: Tuple (deadlock_detected, cycles) where:
-             - deadlock_detected (bool): True if any cycle is found.
-             - cycles (list): A list of cycles detected in the graph.
+             - deadlock_detected (bool): True if any strongly connected
+               component contains a cycle; the limits never change this.
+             - cycles (list): A list of cycles detected in the graph, cut by
+               the limits but never empty when a deadlock exists.
+             With ``capacity`` the tuple is (deadlock_detected, cycles,
+             deadlocked) where deadlocked is the sorted list of deadlocked
+             processes; cycles may then be empty, e.g. when processes ask for
+             more instances than the pool holds.
     """
+    if capacity is None:
+        return _find_cycles(edges, max_cycles, max_length, timeout, witness_only)
+    deadlocked, processes = multi_instance_deadlock(edges, capacity, counts)
+    if not deadlocked:
+        return False, [], []
+    # Keep the deadlocked processes and the resources they wait on or hold
+    stuck = set(processes)
+    edges = [(u, v) for u, v in edges if u in stuck or v in stuck]
+    _, cycles = _find_cycles(edges, max_cycles, max_length, timeout, witness_only)
+    return True, cycles, processes
+
+def _find_cycles(edges, max_cycles, max_length, timeout, witness_only):
     graph = nx.DiGraph()  # Create a directed graph
 
     for edge in edges:
@@ -18,22 +50,83 @@ def detect_deadlock(edges):
             return True, [[u, v]]
         graph.add_edge(u, v)
 
-    # Get all cycles in the graph using simple_cycles
-    cycles = list(nx.simple_cycles(graph))
-    if cycles:
-        return True, cycles  # Deadlock detected with all cycles
-    else:
+    # Decide from the SCCs in linear time; the limits only cut the cycle list
+    witnesses = list(witness_cycles(graph))
+    if not witnesses:
         return False, []  # No deadlock detected
+    if witness_only:
+        return True, witnesses
+    cycles = list(iter_cycles(graph, max_cycles, max_length, timeout))
+    return True, cycles or witnesses  # Deadlock detected with the enumerated cycles
+
+def iter_cycles(graph, max_cycles=None, max_length=None, timeout=None):
+    """
+    Lazily yields elementary cycles of a graph, stopping at the given limits.
+    
+    Enumerating every cycle is exponential on dense graphs, so callers that only
+    need a few of them should consume this generator instead of building a list.
+    
+    :param graph: nx.DiGraph or list of edge tuples.
+    :param max_cycles: Maximum number of cycles to yield (None for no limit).
+    :param max_length: Maximum number of nodes in a yielded cycle (None for no limit).
+    :param timeout: Wall-clock budget in seconds (None for no limit).
+    :return: Generator of cycles (each cycle is a list of nodes).
+    """
+    if not isinstance(graph, nx.DiGraph):
+        graph = nx.DiGraph(graph)
+    if max_cycles is not None and max_cycles <= 0:
+        return
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    found = 0
+    for cycle in nx.simple_cycles(graph, length_bound=max_length):
+        yield cycle  # A cycle that was already found is never thrown away
+        found += 1
+        if max_cycles is not None and found >= max_cycles:
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            return
+
+def witness_cycles(graph):
+    """
+    Yields one cycle per deadlocked strongly connected component.
+    
+    Every process in a non-trivial component is deadlocked, so one witness per
+    component is enough to pick a victim and runs in linear time.
+    
+    :param graph: nx.DiGraph or list of edge tuples.
+    :return: Generator of cycles (each cycle is a list of nodes).
+    """
+    if not isinstance(graph, nx.DiGraph):
+        graph = nx.DiGraph(graph)
+    for component in nx.strongly_connected_components(graph):
+        node = next(iter(component))
+        if len(component) == 1 and not graph.has_edge(node, node):
+            continue
+        cycle = nx.find_cycle(graph.subgraph(component), source=node)
+        yield [u for u, _ in cycle]
 
-def suggest_deadlock_solution(cycles):
+def suggest_deadlock_solution(cycles, cost=None, deadlocked=()):
     """
     Provides suggestions to resolve detected deadlock cycles.
     
     :param cycles: List of cycles (each cycle is a list of nodes).
-    :return: A string with suggestions for each detected cycle.
+    :param cost: Optional victim cost callable (see src.recovery.VictimCost).
+    :param deadlocked: Deadlocked processes from a multi-instance check, used
+                       when there is no cycle to break.
+    :return: A string naming the cheapest processes to terminate and the
+             cycles each of them breaks.
     """
+    if not cycles:
+        if not deadlocked:
+            return ""
+        names = ", ".join(f"'{p}'" for p in deadlocked)
+        return (f"No cycle to break: {names} request more instances than will ever be free; "
+                f"lower those requests or add capacity")
+    edges = {(u, v) for cycle in cycles for u, v in zip(cycle, cycle[1:] + cycle[:1])}
+    plan = plan_recovery(edges, cost=cost)
     suggestions = []
-    for cycle in cycles:
-        # Example suggestion: terminate the first process in the cycle
-        suggestions.append(f"Consider terminating process '{cycle[0]}' to break the cycle: {cycle}")
+    for victim in plan["victims"]:
+        broken = [cycle for cycle in cycles if victim in cycle]
+        suggestions.append(f"Consider terminating process '{victim}' to break the cycle: {broken}")
     return "\n".join(suggestions)
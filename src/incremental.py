@@ -0,0 +1,296 @@
+from bisect import bisect_left, insort
+from collections import deque
+
+# Spacing between the order keys of new or renumbered components
+KEY_GAP = 64
+
+
+class IncrementalDeadlockDetector:
+    """
+    Stateful deadlock detector for wait-for graphs that change a few edges at a time.
+
+    Keeps the strongly connected components (SCCs) of the graph together with an
+    online topological order of the component DAG (Pearce-Kelly). Inserting an edge
+    only searches the components whose order lies between its endpoints, and
+    deleting an edge only re-examines the component that contained it, so the work
+    per update is proportional to the affected region instead of the whole graph.
+
+    Order keys are integers spaced ``KEY_GAP`` apart, so a split component can
+    usually take keys between its own and the next one without touching its
+    neighbours. When that gap runs out every key is renumbered, which keeps the
+    keys bounded by ``KEY_GAP`` times the number of components.
+    """
+
+    def __init__(self, edges=()):
+        self._succ = {}
+        self._pred = {}
+        self._comp = {}      # node -> component id
+        self._members = {}   # component id -> set of nodes
+        self._order = {}     # component id -> order key
+        self._keys = []      # all order keys, sorted
+        self._next_comp = 0
+        for u, v in edges:
+            self.add_edge(u, v)
+
+    # ------------------------------------------------------------------ state
+    def add_node(self, node):
+        """Register a node without edges."""
+        if node in self._comp:
+            return
+        self._succ[node] = set()
+        self._pred[node] = set()
+        self._new_component({node}, self._keys[-1] + KEY_GAP if self._keys else 0)
+
+    def has_edge(self, u, v):
+        return u in self._succ and v in self._succ[u]
+
+    def edges(self):
+        """Return the current edge list."""
+        return [(u, v) for u, targets in self._succ.items() for v in targets]
+
+    def has_deadlock(self):
+        """True if any cycle exists in the current graph."""
+        return bool(self.deadlocked_components())
+
+    def deadlocked_components(self):
+        """Return the node sets of all components that contain a cycle."""
+        return [set(nodes) for nodes in self._members.values() if self._is_cyclic(nodes)]
+
+    def cycles(self):
+        """Return one witness cycle per deadlocked component."""
+        witnesses = []
+        for nodes in self.deadlocked_components():
+            start = next(iter(nodes))
+            if start in self._succ[start]:
+                witnesses.append([start])
+                continue
+            target = next(w for w in self._succ[start] if w in nodes)
+            witnesses.append([start] + self._path(target, start, nodes)[:-1])
+        return witnesses
+
+    # ---------------------------------------------------------------- updates
+    def add_edge(self, u, v):
+        """
+        Insert the edge ``u -> v``.
+
+        :return: List with the cycle created by the edge (``[v, ..., u]``), or an
+                 empty list if the edge does not close a cycle.
+        """
+        self.add_node(u)
+        self.add_node(v)
+        if v in self._succ[u]:
+            return []
+        self._succ[u].add(v)
+        self._pred[v].add(u)
+
+        cu, cv = self._comp[u], self._comp[v]
+        if u == v:
+            return [[u]]
+        if cu == cv:
+            return [self._path(v, u, self._members[cu])]
+        if self._order[cu] < self._order[cv]:
+            return []
+
+        lower, upper = self._order[cv], self._order[cu]
+        forward = self._search(cv, self._comp_successors, lambda key: key <= upper)
+        backward = self._search(cu, self._comp_predecessors, lambda key: key >= lower)
+        merged = forward & backward
+        self._reorder(backward - merged, merged, forward - merged)
+        if not merged:
+            return []
+        return [self._path(v, u, self._members[self._comp[u]])]
+
+    def remove_edge(self, u, v):
+        """
+        Delete the edge ``u -> v``.
+
+        :return: List with the cycle through the edge that was broken
+                 (``[v, ..., u]``), or an empty list if the edge was not on a cycle.
+        """
+        if not self.has_edge(u, v):
+            return []
+        comp = self._comp[u]
+        broken = []
+        if u == v:
+            broken = [[u]]
+        elif comp == self._comp[v]:
+            broken = [self._path(v, u, self._members[comp])]
+
+        self._succ[u].discard(v)
+        self._pred[v].discard(u)
+        if comp == self._comp[v] and len(self._members[comp]) > 1:
+            self._split(comp)
+        return broken
+
+    def apply_events(self, events):
+        """
+        Apply ("add" | "remove", (u, v)) events, e.g. RealTimeMonitor.deltas_since.
+
+        :return: Tuple (created, broken) lists of cycles.
+        """
+        created, broken = [], []
+        for op, (u, v) in events:
+            if op == "add":
+                created += self.add_edge(u, v)
+            else:
+                broken += self.remove_edge(u, v)
+        return created, broken
+
+    # -------------------------------------------------------------- internals
+    def _new_component(self, nodes, key):
+        comp = self._next_comp
+        self._next_comp += 1
+        self._members[comp] = nodes
+        self._order[comp] = key
+        insort(self._keys, key)
+        for node in nodes:
+            self._comp[node] = comp
+        return comp
+
+    def _is_cyclic(self, nodes):
+        if len(nodes) > 1:
+            return True
+        node = next(iter(nodes))
+        return node in self._succ[node]
+
+    def _comp_successors(self, comp):
+        return {self._comp[w] for n in self._members[comp] for w in self._succ[n]} - {comp}
+
+    def _comp_predecessors(self, comp):
+        return {self._comp[w] for n in self._members[comp] for w in self._pred[n]} - {comp}
+
+    def _search(self, start, neighbours, in_range):
+        """Collect components reachable from ``start`` whose key satisfies ``in_range``."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for nxt in neighbours(stack.pop()):
+                if nxt not in seen and in_range(self._order[nxt]):
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def _reorder(self, before, merged, after):
+        """Reassign the affected keys so that ``before < merged < after`` holds."""
+        affected = before | merged | after
+        pool = sorted(self._order[c] for c in affected)
+        by_key = lambda c: self._order[c]
+        before = sorted(before, key=by_key)
+        after = sorted(after, key=by_key)
+        # Moving ``before`` to the lowest and ``after`` to the highest keys of the
+        # pool only ever shifts them away from their external neighbours.
+        for comp, key in zip(before, pool):
+            self._order[comp] = key
+        for comp, key in zip(after, pool[len(pool) - len(after):]):
+            self._order[comp] = key
+        if merged:
+            nodes = set()
+            for comp in merged:
+                nodes |= self._members.pop(comp)
+                del self._order[comp]
+            for key in pool[len(before):len(pool) - len(after)]:
+                self._drop_key(key)
+            self._new_component(nodes, pool[len(before)])
+
+    def _split(self, comp):
+        """Recompute the SCCs inside ``comp`` after one of its edges was removed."""
+        nodes = self._members[comp]
+        parts = _tarjan(nodes, self._succ)
+        if len(parts) == 1:
+            return
+        key = self._order[comp]
+        position = bisect_left(self._keys, key)
+        if position + 1 < len(self._keys):
+            step = (self._keys[position + 1] - key) // len(parts)
+        else:
+            step = KEY_GAP
+        if step == 0:
+            self._renumber(comp, len(parts))
+            key, step = self._order[comp], KEY_GAP
+        del self._order[comp]
+        del self._members[comp]
+        self._drop_key(key)
+        # Tarjan emits components in reverse topological order.
+        for index, part in enumerate(reversed(parts)):
+            self._new_component(part, key + index * step)
+
+    def _drop_key(self, key):
+        del self._keys[bisect_left(self._keys, key)]
+
+    def _renumber(self, wide, slots):
+        """Spread all keys ``KEY_GAP`` apart, keeping their order; ``wide`` gets ``slots`` gaps."""
+        key = 0
+        self._keys = []
+        for comp in sorted(self._order, key=self._order.__getitem__):
+            self._order[comp] = key
+            self._keys.append(key)
+            key += KEY_GAP * (slots if comp == wide else 1)
+
+    def _path(self, source, target, allowed):
+        """Shortest path ``source -> target`` using only nodes in ``allowed``."""
+        parent = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                break
+            for nxt in self._succ[node]:
+                if nxt in allowed and nxt not in parent:
+                    parent[nxt] = node
+                    queue.append(nxt)
+        path = []
+        node = target
+        while node is not None:
+            path.append(node)
+            node = parent[node]
+        return path[::-1]
+
+
+def _tarjan(nodes, succ):
+    """Iterative Tarjan SCC over the subgraph induced by ``nodes``."""
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(succ[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in nodes:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(succ[child])))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
@@ -0,0 +1,99 @@
+import numpy as np
+from src.banker import safety_order
+from src.rag import node_kind, PROCESS
+
+
+def coffman_detect(available, request, allocation):
+    """
+    Coffman's detection algorithm over dense count matrices.
+
+    :param available: Length-m vector of free instances per resource.
+    :param request: n x m matrix of outstanding requests.
+    :param allocation: n x m matrix of held instances.
+    :return: Boolean vector, True for deadlocked processes.
+    """
+    finished, _ = safety_order(available, request, allocation)
+    return ~finished
+
+
+def reduce_counts(num_processes, available, req_p, req_r, req_n, hold_p, hold_r, hold_n):
+    """
+    Graph reduction on sparse (process, resource, count) edge arrays.
+
+    Equivalent to coffman_detect, but each round only touches the edges of
+    processes that are still blocked, so the cost is O(edges) per round
+    instead of O(processes x resources).
+
+    :return: Boolean vector, True for deadlocked processes.
+    """
+    work = np.array(available, dtype=np.int64)
+    m = len(work)
+    # Merge duplicate (process, resource) requests into one count
+    keys, inverse = np.unique(np.asarray(req_p, dtype=np.int64) * m + req_r, return_inverse=True)
+    req_n = np.bincount(inverse, weights=req_n).astype(np.int64)
+    req_p, req_r = np.divmod(keys, m)
+    hold_p = np.asarray(hold_p, dtype=np.int64)
+    hold_r = np.asarray(hold_r, dtype=np.int64)
+    hold_n = np.asarray(hold_n, dtype=np.int64)
+
+    finished = np.zeros(num_processes, dtype=bool)
+    while True:
+        unmet = req_n > work[req_r]
+        blocked = np.bincount(req_p[unmet], minlength=num_processes) > 0
+        ready = ~finished & ~blocked
+        if not ready.any():
+            break
+        finished |= ready
+        released = ready[hold_p]
+        work += np.bincount(hold_r[released], weights=hold_n[released], minlength=m).astype(np.int64)
+        keep = ~finished[req_p]
+        req_p, req_r, req_n = req_p[keep], req_r[keep], req_n[keep]
+        keep = ~released
+        hold_p, hold_r, hold_n = hold_p[keep], hold_r[keep], hold_n[keep]
+    return ~finished
+
+
+def multi_instance_deadlock(edges, capacity, counts=None):
+    """
+    Detects deadlock in a resource allocation graph with multi-instance resources.
+
+    With more than one instance per resource a cycle is necessary but not
+    sufficient for deadlock, so this reduces the graph instead of looking
+    for cycles.
+
+    :param edges: List of tuples; P -> R is a request, R -> P an assignment.
+    :param capacity: Dict of resource -> total instances (missing resources have 1).
+    :param counts: Optional dict of edge -> instances requested or held (default 1).
+    :return: Tuple (deadlock_detected, deadlocked) where deadlocked is the
+             sorted list of deadlocked processes.
+    """
+    processes = {}
+    resources = {}
+    requests = []
+    holds = []
+    for edge in edges:
+        u, v = edge
+        count = counts.get(edge, 1) if counts else 1
+        if node_kind(u) == PROCESS:
+            p, r, target = u, v, requests
+        else:
+            p, r, target = v, u, holds
+        target.append((processes.setdefault(p, len(processes)), resources.setdefault(r, len(resources)), count))
+    for r in capacity:
+        resources.setdefault(r, len(resources))
+
+    req = np.array(requests, dtype=np.int64).reshape(-1, 3)
+    hold = np.array(holds, dtype=np.int64).reshape(-1, 3)
+    total = np.ones(len(resources), dtype=np.int64)
+    for r, i in resources.items():
+        total[i] = capacity.get(r, 1)
+    available = total - np.bincount(hold[:, 1], weights=hold[:, 2], minlength=len(resources)).astype(np.int64)
+    if (available < 0).any():
+        over = [r for r, i in resources.items() if available[i] < 0]
+        raise ValueError(f"More instances assigned than exist for: {', '.join(map(str, over))}")
+
+    deadlocked = reduce_counts(len(processes), available, req[:, 0], req[:, 1], req[:, 2],
+                               hold[:, 0], hold[:, 1], hold[:, 2])
+    names = list(processes)
+    stuck = sorted(names[i] for i in np.flatnonzero(deadlocked).tolist())
+    return bool(stuck), stuck
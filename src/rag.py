@@ -0,0 +1,213 @@
+import numpy as np
+
+# Node kind bits
+PROCESS = 1
+RESOURCE = 2
+
+
+def node_kind(name):
+    """Infer the kind bit of a node from its label ('P...' or 'R...')."""
+    label = str(name)
+    if label.startswith('P'):
+        return PROCESS
+    if label.startswith('R'):
+        return RESOURCE
+    return 0
+
+
+class CompactRAG:
+    """
+    Integer-indexed resource allocation graph stored as CSR arrays.
+
+    Node labels are interned once into ``names``/``index``; all traversal runs on
+    the int32 ``indptr``/``indices`` arrays, and the process/resource kind of each
+    node is kept in the ``kind`` bitmask array.
+    """
+
+    def __init__(self, names, indptr, indices, kind=None):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        if kind is None:
+            kind = [node_kind(name) for name in self.names]
+        self.kind = np.asarray(kind, dtype=np.uint8)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Build a graph from a list of (source, target) tuples."""
+        names = []
+        index = {}
+        src = []
+        dst = []
+        for u, v in edges:
+            for node in (u, v):
+                if node not in index:
+                    index[node] = len(names)
+                    names.append(node)
+            src.append(index[u])
+            dst.append(index[v])
+        return cls.from_arrays(np.array(src, dtype=np.int32), np.array(dst, dtype=np.int32), names)
+
+    @classmethod
+    def from_arrays(cls, src, dst, names):
+        """Build a graph from parallel int arrays of edge endpoints."""
+        n = len(names)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        # Sort by (src, dst) and drop duplicate edges like nx.DiGraph does
+        keys = np.unique(src * max(n, 1) + dst)
+        src, dst = np.divmod(keys, max(n, 1))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(names, indptr, dst.astype(np.int32))
+
+    def to_edges(self):
+        """Return the graph as a list of (source, target) label tuples."""
+        src, dst = self.edge_arrays()
+        names = self.names
+        return [(names[u], names[v]) for u, v in zip(src.tolist(), dst.tolist())]
+
+    def edge_arrays(self):
+        """Return the (src, dst) int arrays of all edges."""
+        src = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+        return src, self.indices
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def successors(self, node):
+        """Return the int ids of the successors of node id ``node``."""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        return np.bincount(self.indices, minlength=self.num_nodes)
+
+    def processes(self):
+        """Return the int ids of all process nodes."""
+        return np.flatnonzero(self.kind & PROCESS)
+
+    def resources(self):
+        """Return the int ids of all resource nodes."""
+        return np.flatnonzero(self.kind & RESOURCE)
+
+    def density(self):
+        n = self.num_nodes
+        return self.num_edges / (n * (n - 1)) if n > 1 else 0.0
+
+    def strongly_connected_components(self):
+        """
+        Label the strongly connected components with an iterative Tarjan.
+
+        :return: Tuple (count, labels) where labels[i] is the component of node i.
+                 Components are numbered in reverse topological order.
+        """
+        n = self.num_nodes
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        index = [-1] * n
+        low = [0] * n
+        cursor = [0] * n
+        on_stack = [False] * n
+        labels = [-1] * n
+        stack = []
+        counter = 0
+        count = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            cursor[root] = indptr[root]
+            stack.append(root)
+            on_stack[root] = True
+            call = [root]
+            while call:
+                v = call[-1]
+                i = cursor[v]
+                end = indptr[v + 1]
+                while i < end:
+                    w = indices[i]
+                    i += 1
+                    if index[w] == -1:
+                        cursor[v] = i
+                        index[w] = low[w] = counter
+                        counter += 1
+                        cursor[w] = indptr[w]
+                        stack.append(w)
+                        on_stack[w] = True
+                        call.append(w)
+                        break
+                    if on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                else:
+                    call.pop()
+                    if call and low[v] < low[call[-1]]:
+                        low[call[-1]] = low[v]
+                    if low[v] == index[v]:
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            labels[w] = count
+                            if w == v:
+                                break
+                        count += 1
+        return count, np.array(labels, dtype=np.int32)
+
+    def cyclic_components(self, labels=None):
+        """Return the labels of components that contain a cycle."""
+        if labels is None:
+            _, labels = self.strongly_connected_components()
+        sizes = np.bincount(labels, minlength=labels.max() + 1 if len(labels) else 0)
+        cyclic = sizes > 1
+        src, dst = self.edge_arrays()
+        loops = src[src == dst]
+        cyclic[labels[loops]] = True
+        return np.flatnonzero(cyclic)
+
+    def has_cycle(self):
+        return len(self.cyclic_components()) > 0
+
+    def find_cycle(self, labels=None, component=None):
+        """
+        Return one cycle as a list of node labels, or an empty list.
+
+        :param labels: Precomputed SCC labels (optional).
+        :param component: Restrict the search to this SCC label (optional).
+        """
+        if labels is None:
+            _, labels = self.strongly_connected_components()
+        if component is None:
+            cyclic = self.cyclic_components(labels)
+            if not len(cyclic):
+                return []
+            component = cyclic[0]
+        return self.walk_cycle(int(np.flatnonzero(labels == component)[0]), labels)
+
+    def walk_cycle(self, node, labels):
+        """Return a cycle inside the cyclic component of node id ``node``."""
+        # Every node of a cyclic SCC has a successor inside it, so walking
+        # forward inside the component must revisit a node.
+        component = labels[node]
+        position = {}
+        walk = []
+        while node not in position:
+            position[node] = len(walk)
+            walk.append(node)
+            targets = self.successors(node)
+            node = int(targets[labels[targets] == component][0])
+        return [self.names[v] for v in walk[position[node]:]]
+
+    def cycles(self):
+        """Return one witness cycle per cyclic component."""
+        _, labels = self.strongly_connected_components()
+        return [self.find_cycle(labels, c) for c in self.cyclic_components(labels)]
@@ -0,0 +1,167 @@
+import time
+import networkx as nx
+from src.rag import node_kind, PROCESS
+
+
+class VictimCost:
+    """
+    Configurable cost of terminating a process (or preempting an edge).
+
+    cost = priority_weight * priority + held_weight * held resources
+           + rollback_weight * rollback cost
+
+    An edge costs as much as the process at either end of it.
+    """
+
+    def __init__(self, priority=None, rollback=None, priority_weight=1.0, held_weight=1.0,
+                 rollback_weight=1.0, base=1.0):
+        """
+        :param priority: Dict of process -> priority (higher is more expensive to kill).
+        :param rollback: Dict of process -> work lost if it is rolled back.
+        :param base: Cost every victim has, so the plan prefers fewer victims.
+        """
+        self.priority = priority or {}
+        self.rollback = rollback or {}
+        self.priority_weight = priority_weight
+        self.held_weight = held_weight
+        self.rollback_weight = rollback_weight
+        self.base = base
+
+    def __call__(self, victim, graph):
+        if isinstance(victim, tuple):
+            u, v = victim
+            return self(u if node_kind(u) == PROCESS else v, graph)
+        held = graph.in_degree(victim) if victim in graph else 0  # R -> P assignment edges
+        return (self.base
+                + self.priority_weight * self.priority.get(victim, 0)
+                + self.held_weight * held
+                + self.rollback_weight * self.rollback.get(victim, 0))
+
+
+def plan_recovery(edges, mode="process", cost=None, exact_limit=12, time_budget=1.0):
+    """
+    Finds a minimum-cost set of victims whose removal breaks every cycle.
+
+    This is a weighted feedback vertex set (mode "process") or feedback arc set
+    (mode "edge"), solved independently per deadlocked SCC: branch and bound
+    for SCCs with at most ``exact_limit`` candidates, greedy otherwise or once
+    the time budget runs out.
+
+    :param edges: List of tuples representing process-resource relationships.
+    :param mode: "process" to terminate processes, "edge" to preempt edges.
+    :param cost: Callable (victim, graph) -> cost; defaults to VictimCost().
+    :param exact_limit: Largest candidate count searched exactly.
+    :param time_budget: Seconds allowed for the exact searches in total.
+    :return: Dict with "victims" (list), "cost" (float) and "exact" (bool,
+             True when every SCC was solved optimally).
+    """
+    if mode not in ("process", "edge"):
+        raise ValueError(f"Unknown recovery mode: {mode}")
+    graph = nx.DiGraph(edges)
+    cost = cost or VictimCost()
+    deadline = time.monotonic() + time_budget
+    victims = []
+    exact = True
+    for component in nx.strongly_connected_components(graph):
+        node = next(iter(component))
+        if len(component) == 1 and not graph.has_edge(node, node):
+            continue
+        scc = graph.subgraph(component)
+        candidates = _candidates(scc, mode)
+        weights = {c: cost(c, graph) for c in candidates}
+        chosen = _greedy(scc, mode, weights)
+        if len(candidates) <= exact_limit:
+            solved = _exact(scc, mode, weights, chosen, deadline)
+            if solved is None:
+                exact = False
+            else:
+                chosen = solved
+        else:
+            exact = False
+        victims.extend(chosen)
+    total = sum(cost(v, graph) for v in victims)
+    return {"victims": victims, "cost": total, "exact": exact}
+
+
+def apply_recovery(edges, victims, mode="process"):
+    """Return the edge list with the victims (processes or edges) removed."""
+    victims = set(victims)
+    if mode == "edge":
+        return [edge for edge in edges if tuple(edge) not in victims]
+    return [(u, v) for u, v in edges if u not in victims and v not in victims]
+
+
+def _candidates(scc, mode):
+    if mode == "edge":
+        return list(scc.edges())
+    processes = [n for n in scc if node_kind(n) == PROCESS]
+    return processes or list(scc)
+
+
+def _without(graph, mode, removed):
+    if mode == "edge":
+        return nx.restricted_view(graph, [], removed)
+    return nx.restricted_view(graph, removed, [])
+
+
+def _cycle_candidates(cycle, mode, weights):
+    if mode == "edge":
+        members = [(u, v) for u, v, *_ in cycle]
+    else:
+        members = [u for u, *_ in cycle]
+    return [m for m in members if m in weights]
+
+
+def _greedy(scc, mode, weights):
+    """Repeatedly remove the candidate on the most cycles per unit cost, then drop redundant picks."""
+    removed = []
+    while True:
+        view = _without(scc, mode, removed)
+        core = [c for c in nx.strongly_connected_components(view)
+                if len(c) > 1 or any(view.has_edge(n, n) for n in c)]
+        if not core:
+            break
+        core = view.subgraph(set().union(*core))
+        if mode == "edge":
+            options = [e for e in core.edges() if e in weights]
+            score = {e: core.in_degree(e[0]) * core.out_degree(e[1]) for e in options}
+        else:
+            options = [n for n in core if n in weights]
+            score = {n: core.in_degree(n) * core.out_degree(n) for n in options}
+        removed.append(max(options, key=lambda c: score[c] / max(weights[c], 1e-9)))
+    # Put back victims that are not needed, most expensive first
+    for victim in sorted(removed, key=lambda c: -weights[c]):
+        rest = [c for c in removed if c != victim]
+        if nx.is_directed_acyclic_graph(_without(scc, mode, rest)):
+            removed = rest
+    return removed
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+def _exact(scc, mode, weights, incumbent, deadline):
+    """Branch on the candidates of one remaining cycle; None if the deadline passes."""
+    best = [list(incumbent), sum(weights[c] for c in incumbent)]
+
+    def branch(chosen, spent, forbidden):
+        if spent >= best[1]:
+            return
+        if time.monotonic() > deadline:
+            raise _OutOfTime
+        try:
+            cycle = nx.find_cycle(_without(scc, mode, chosen))
+        except nx.NetworkXNoCycle:
+            best[0], best[1] = list(chosen), spent
+            return
+        options = [c for c in _cycle_candidates(cycle, mode, weights) if c not in forbidden]
+        options.sort(key=lambda c: weights[c])
+        for i, option in enumerate(options):
+            branch(chosen + [option], spent + weights[option], forbidden | set(options[:i]))
+
+    try:
+        branch([], 0.0, frozenset())
+    except _OutOfTime:
+        return None
+    return best[0]
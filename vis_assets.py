@@ -0,0 +1,138 @@
+"""
+Offline vis-network pages built from the vendored lib/vis-9.1.2 bundle.
+
+The bundle is read once per process and each page template is assembled once
+per (options, height) pair; a render only serializes the graph data. Graph data
+is compact JSON: node labels, one group index per node, a flat
+[from, to, from, to, ...] edge index list and optional fixed x/y coordinates,
+expanded into DataSets in the browser.
+
+By default the bundle is inlined so the page works with no network at all. Set
+VIS_NETWORK_URL (e.g. "app/static/vis-network.min.js" with Streamlit static
+serving) to reference a browser-cached copy instead of inlining it.
+"""
+import json
+import os
+from functools import lru_cache
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib", "vis-9.1.2")
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+{script}
+<style>
+#network {{ width: 100%; height: {height}px; {style} }}
+</style>
+</head>
+<body>
+<div id="network"></div>
+<script>
+var options = {options};
+var d = """
+
+_TAIL = """;
+var nodes = new vis.DataSet(d.n.map(function (label, i) {
+  var node = { id: i, label: label, group: d.g[i] };
+  if (d.x) { node.x = d.x[i]; node.y = d.y[i]; }
+  return node;
+}));
+var hot = {};
+d.h.forEach(function (i) { hot[i] = true; });
+var list = [];
+for (var i = 0; i < d.e.length; i += 2) {
+  var edge = { id: i / 2, from: d.e[i], to: d.e[i + 1] };
+  if (hot[i / 2]) { edge.color = d.hc; edge.width = 3; }
+  list.push(edge);
+}
+new vis.Network(document.getElementById("network"),
+                { nodes: nodes, edges: new vis.DataSet(list) }, options);
+</script>
+</body>
+</html>
+"""
+
+
+@lru_cache(maxsize=1)
+def vis_script_tag():
+    """<script> element for vis-network: the local URL if configured, else the inlined bundle."""
+    url = os.environ.get("VIS_NETWORK_URL")
+    if url:
+        return f'<script src="{url}"></script>'
+    with open(os.path.join(VIS_DIR, "vis-network.min.js"), encoding="utf-8") as f:
+        return f"<script>{f.read()}</script>"
+
+
+@lru_cache(maxsize=32)
+def _page_head(options, height, style):
+    return _PAGE.format(script=vis_script_tag(), height=height, style=style, options=options)
+
+
+def compact_json(value):
+    """Minified JSON that is safe to embed inside a <script> element."""
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
+
+
+def graph_payload(edges, group_of, highlight=(), highlight_color="#FF0000", label_of=str, nodes=(),
+                  positions=None):
+    """
+    Index-based graph data for the page template.
+
+    :param edges: Iterable of (source, target) label pairs.
+    :param group_of: Function mapping a node label to its vis group name.
+    :param highlight: Edges to draw in ``highlight_color``.
+    :param label_of: Function mapping a node to its displayed label.
+    :param nodes: Extra nodes to show even if no edge touches them.
+    :param positions: Optional dict of node -> (x, y) in [-1, 1]; nodes without
+                      one are placed at the origin.
+    """
+    index = dict.fromkeys(nodes)
+    for i, node in enumerate(index):
+        index[node] = i
+    flat = []
+    edge_ids = {}
+    for u, v in edges:
+        for node in (u, v):
+            if node not in index:
+                index[node] = len(index)
+        edge_ids.setdefault((u, v), len(flat) // 2)
+        flat.append(index[u])
+        flat.append(index[v])
+    labels = list(index)
+    payload = {
+        "n": [label_of(label) for label in labels],
+        "g": [group_of(label) for label in labels],
+        "e": flat,
+        "h": sorted({edge_ids[e] for e in highlight if e in edge_ids}),
+        "hc": highlight_color,
+    }
+    if positions is not None:
+        # Pixel scale grows with the node count so labels do not overlap
+        scale = 150 + 25 * len(labels) ** 0.5
+        xy = [positions.get(label, (0.0, 0.0)) for label in labels]
+        payload["x"] = [round(x * scale) for x, _ in xy]
+        payload["y"] = [round(y * scale) for _, y in xy]
+    return payload
+
+
+def network_html(payload, options, height=600, style=""):
+    """
+    Full HTML page for a vis network.
+
+    :param payload: Data from graph_payload().
+    :param options: vis options as a dict, or an already serialized JSON string.
+    """
+    if not isinstance(options, str):
+        options = compact_json(options)
+    return _page_head(options, height, style) + compact_json(payload) + _TAIL
+
+
+def cycle_edges(cycle):
+    """Edges of a cycle given either as edge tuples or as an ordered node list."""
+    if not cycle:
+        return set()
+    cycle = list(cycle)
+    if all(isinstance(item, tuple) and len(item) == 2 for item in cycle):
+        return set(cycle)
+    return set(zip(cycle, cycle[1:] + cycle[:1]))